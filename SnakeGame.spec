@@ -22,6 +22,7 @@ exe = EXE(
     a.binaries,
     a.datas,
     Tree('assets', prefix='assets'),
+    Tree('levels', prefix='levels'),
     name='SnakeGameAdventure',
     debug=False,
     bootloader_ignore_signals=False,
@@ -0,0 +1,82 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Startup-optimized build: pyinstaller SnakeGameFast.spec
+#
+# Unlike SnakeGame.spec this builds a folder (onedir), so nothing is
+# unpacked to a temp dir on launch; assets and levels sit next to the
+# executable and are only opened when first played or loaded. Bytecode is
+# precompiled with optimize=2, UPX is off (decompressing costs more at
+# startup than it saves on disk) and modules the game never imports are
+# left out. Compare the two builds with bench_startup.py.
+
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=[
+        # pygame: only the mixer, and for low-latency audio the SDL audio
+        # device with NumPy, are used.
+        'pygame.examples',
+        'pygame.tests',
+        'pygame.docs',
+        'pygame.camera',
+        'pygame.midi',
+        'pygame.freetype',
+        'pygame.ftfont',
+        'pygame._sdl2.controller',
+        'pygame.surfarray',
+        # rich: only consoles, panels and tables are used.
+        'rich.syntax',
+        'rich.markdown',
+        'rich.progress',
+        'rich.traceback',
+        'rich.logging',
+        'rich.tree',
+        'pygments',
+        'IPython',  # Only for rich's Jupyter support.
+        'ipywidgets',
+        # Never imported by the game; multiprocessing only by the benchmarks
+        # and the training environment.
+        'tkinter',
+        'pydoc',
+        'multiprocessing',
+    ],
+    noarchive=False,
+    optimize=2,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='SnakeGameAdventure',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=True,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    version='versionfile.txt',
+    icon=['favicon.ico'],
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    Tree('assets', prefix='assets'),
+    Tree('levels', prefix='levels'),
+    strip=False,
+    upx=False,
+    name='SnakeGameAdventure',
+)
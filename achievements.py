@@ -1,8 +1,10 @@
 # achievements.py
 import os
 import json
+import time
 import datetime
 from rich.console import Console
+import metrics
 
 console = Console()
 ACHIEVEMENTS_FILE = "achievements.json"
@@ -45,11 +47,13 @@ class AchievementsManager:
             self.save_stats()
 
     def save_stats(self):
+        started = time.perf_counter()
         try:
             with open(self.filename, "w") as f:
                 json.dump(self.stats, f, indent=4)
         except Exception as e:
             console.print(f"[red]Error saving achievements: {e}[/red]")
+        metrics.WRITE_SECONDS.observe(time.perf_counter() - started, "achievements")
 
     def update_stats(self, score):
         self.stats["total_games"] += 1
@@ -70,6 +74,7 @@ class AchievementsManager:
             self.stats["achievements"].append(
                 {"name": achievement_key, "unlock_time": unlock_time}
             )
+            metrics.ACHIEVEMENTS.inc(value=achievement_key)
             console.print(
                 f"[bold green]Achievement Unlocked: {achievement_key} at {unlock_time}![/bold green]"
             )
@@ -1,7 +1,81 @@
 # audio.py
 import os
 import sys
-import pygame
+
+pygame = None  # Imported on first use; it is the slowest import at startup.
+SOUNDS = {}  # Each sound file is loaded once and replayed from here.
+SAMPLES = {}  # The same for the low-latency mixer, as int16 arrays.
+
+low_latency = False  # Mix in-process through audiomix instead of pygame.mixer.
+mixer = None  # The audiomix.Mixer and its sink while low_latency is on.
+sink = None
+
+
+def load_pygame():
+    global pygame
+    if pygame is None:
+        # The import prints a banner, which would land on top of the menu.
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+        import pygame as module
+
+        pygame = module
+    return pygame
+
+
+def preload():
+    """Import what the chosen backend needs, so the first sound plays at once."""
+    load_pygame()
+    if low_latency and start_mixer() is not None:
+        assets = resource_path("assets")
+        for name in sorted(os.listdir(assets)) if os.path.isdir(assets) else ():
+            if name.endswith(".wav"):
+                load_samples(f"assets/{name}")
+
+
+def set_low_latency(enabled):
+    """Switch backends, stopping the old one; True if anything changed."""
+    global low_latency, mixer, sink
+    if enabled == low_latency:
+        return False
+    stop_music()
+    if sink is not None:
+        sink.close()
+        mixer = sink = None
+    if enabled and pygame is not None and pygame.mixer.get_init():
+        pygame.mixer.quit()  # Free the device for the mixer's own stream.
+    low_latency = enabled
+    return True
+
+
+def start_mixer():
+    """The running audiomix.Mixer, opening the sound device on first use."""
+    global low_latency, mixer, sink
+    if mixer is None:
+        try:
+            import audiomix
+
+            load_pygame()
+            mixer = audiomix.Mixer()
+            sink = audiomix.DeviceSink(mixer)
+        except Exception as e:
+            print(f"Low-latency audio unavailable, using pygame.mixer: {e}")
+            mixer = sink = None
+            low_latency = False
+    return mixer
+
+
+def load_samples(sound_file):
+    """sound_file as an array for the mixer, loaded once; None if missing."""
+    samples = SAMPLES.get(sound_file)
+    if samples is None:
+        file_path = resource_path(sound_file)
+        if not os.path.exists(file_path):
+            print(f"Sound file {sound_file} not found.")
+            return None
+        import audiomix
+
+        samples = SAMPLES[sound_file] = audiomix.load_wav(file_path)
+    return samples
 
 
 def resource_path(relative_path):
@@ -14,27 +88,45 @@ def resource_path(relative_path):
 
 
 def init_audio():
-    if not pygame.mixer.get_init():
+    load_pygame()
+    if low_latency:
+        start_mixer()
+    if not low_latency and not pygame.mixer.get_init():
         pygame.mixer.pre_init(frequency=16000, size=-16, channels=2, buffer=1024)
         pygame.mixer.init()
     play_music("assets/music.wav")
 
 
 def play_sound(sound_file):
+    if low_latency and start_mixer() is not None:
+        samples = load_samples(sound_file)
+        if samples is not None:
+            mixer.play(samples)
+        return
+    load_pygame()
     if not pygame.mixer.get_init():
         pygame.mixer.init()
-    file_path = resource_path(sound_file)
-    if os.path.exists(file_path):
-        sound = pygame.mixer.Sound(file_path)
-        sound.play()
-    else:
-        print(f"Sound file {sound_file} not found.")
+    sound = SOUNDS.get(sound_file)
+    if sound is None:
+        file_path = resource_path(sound_file)
+        if not os.path.exists(file_path):
+            print(f"Sound file {sound_file} not found.")
+            return
+        sound = SOUNDS[sound_file] = pygame.mixer.Sound(file_path)
+    sound.play()
 
 
 def play_music(music_file):
+    file_path = resource_path(music_file)
+    if low_latency and start_mixer() is not None:
+        if os.path.exists(file_path):
+            mixer.set_music(load_samples(music_file))
+        else:
+            print(f"Music file {music_file} not found.")
+        return
+    load_pygame()
     if not pygame.mixer.get_init():
         pygame.mixer.init()
-    file_path = resource_path(music_file)
     if os.path.exists(file_path):
         pygame.mixer.music.load(file_path)
         pygame.mixer.music.play(-1)  # Loop indefinitely
@@ -43,5 +135,7 @@ def play_music(music_file):
 
 
 def stop_music():
-    if pygame.mixer.get_init():
+    if mixer is not None:
+        mixer.set_music(None)
+    if pygame is not None and pygame.mixer.get_init():
         pygame.mixer.music.stop()
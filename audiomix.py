@@ -0,0 +1,173 @@
+# audiomix.py
+import threading
+import time
+import wave
+from collections import deque
+import numpy as np
+
+RATE = 16000
+CHANNELS = 2
+CHUNK = 256  # Frames per callback: 16 ms, against 64 ms for pygame.mixer's 1024.
+MAX_VOICES = 8  # Effects mixed at once; the oldest stop beyond this.
+
+
+def load_wav(path, rate=RATE, channels=CHANNELS):
+    """A 16-bit WAV file as an int16 array of (frames, channels) at rate."""
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"{path} is not a 16-bit WAV file")
+        file_rate = f.getframerate()
+        file_channels = f.getnchannels()
+        data = f.readframes(f.getnframes())
+    samples = np.frombuffer(data, dtype="<i2").reshape(-1, file_channels)
+    if file_channels != channels:
+        samples = np.repeat(samples[:, :1], channels, axis=1)
+    if file_rate != rate and len(samples):
+        # Linear resampling, done once at load time.
+        times = np.arange(int(len(samples) * rate / file_rate)) * file_rate / rate
+        samples = np.stack(
+            [np.interp(times, np.arange(len(samples)), column) for column in samples.T],
+            axis=1,
+        )
+    return np.ascontiguousarray(samples, dtype=np.int16)
+
+
+class Mixer:
+    """Mix sound effects into the music in-process, a small chunk at a time.
+
+    Sounds are int16 arrays loaded once. fill adds the music and every
+    playing effect into an int32 buffer and clips it back to int16 with a
+    few array operations, so an effect starts in the next chunk pulled, at
+    most one chunk after play. play only appends to a deque that the audio
+    thread drains, so the game never waits on a lock.
+    """
+
+    def __init__(self, chunk=CHUNK, rate=RATE, channels=CHANNELS):
+        self.chunk = chunk
+        self.rate = rate
+        self.channels = channels
+        self.music = None
+        self.music_pos = 0
+        self.pending = deque()  # (samples, time play was called) from play.
+        self.voices = []  # [samples, next frame] for each playing effect.
+        self.starts = deque(maxlen=1024)  # (played, mixed) times, for benchmarks.
+        self.accumulator = np.zeros((chunk, channels), dtype=np.int32)
+        self.output = np.zeros((chunk, channels), dtype=np.int16)
+
+    def play(self, samples):
+        self.pending.append((samples, time.perf_counter()))
+
+    def set_music(self, samples):
+        """Loop samples under the effects, or stop the music with None."""
+        self.music = samples if samples is not None and len(samples) else None
+        self.music_pos = 0
+
+    def fill(self, frames=None):
+        """The next frames of mixed output as int16 (frames, channels)."""
+        frames = frames or self.chunk
+        if frames > len(self.accumulator):
+            self.accumulator = np.zeros((frames, self.channels), dtype=np.int32)
+            self.output = np.zeros((frames, self.channels), dtype=np.int16)
+        mix = self.accumulator[:frames]
+        mix.fill(0)
+        music = self.music
+        if music is not None:
+            pos = self.music_pos % len(music)  # The music may just have changed.
+            filled = 0
+            while filled < frames:
+                take = min(frames - filled, len(music) - pos)
+                mix[filled : filled + take] += music[pos : pos + take]
+                filled += take
+                pos = (pos + take) % len(music)
+            self.music_pos = pos
+        while self.pending:
+            samples, played = self.pending.popleft()
+            self.voices.append([samples, 0])
+            self.starts.append((played, time.perf_counter()))
+        del self.voices[:-MAX_VOICES]
+        for voice in self.voices:
+            samples, pos = voice
+            take = min(frames, len(samples) - pos)
+            mix[:take] += samples[pos : pos + take]
+            voice[1] = pos + take
+        self.voices = [voice for voice in self.voices if voice[1] < len(voice[0])]
+        np.clip(mix, -32768, 32767, out=mix)
+        output = self.output[:frames]
+        output[...] = mix
+        return output
+
+
+class DeviceSink:
+    """Play a Mixer on the sound card, filled from SDL's audio callback."""
+
+    def __init__(self, mixer):
+        import pygame
+        from pygame._sdl2 import audio as sdl_audio
+        from pygame._sdl2 import sdl2
+
+        sdl2.init_subsystem(sdl2.INIT_AUDIO)
+        names = sdl_audio.get_audio_device_names(False)
+        self.mixer = mixer
+        self.device = sdl_audio.AudioDevice(
+            devicename=names[0] if names else "",
+            iscapture=False,
+            frequency=mixer.rate,
+            audioformat=sdl_audio.AUDIO_S16,
+            numchannels=mixer.channels,
+            chunksize=mixer.chunk,
+            allowed_changes=0,
+            callback=self.callback,
+        )
+        self.device.pause(0)
+        self.quit_audio = pygame.mixer.quit
+
+    def callback(self, device, stream):
+        frames = len(stream) // (2 * self.mixer.channels)
+        stream[:] = self.mixer.fill(frames).tobytes()
+
+    def close(self):
+        self.device.close()
+        # pygame.mixer.init does nothing while SDL audio is initialized, so
+        # shut it down for pygame.mixer to open the device again.
+        self.quit_audio()
+
+
+class NullSink:
+    """Pull chunks from a Mixer at the pace a sound card would, without one.
+
+    The output is dropped, or written to a WAV file when path is given. It
+    stands in for DeviceSink in tests and in bench_audio.py.
+    """
+
+    def __init__(self, mixer, path=None):
+        self.mixer = mixer
+        self.wav = None
+        if path:
+            self.wav = wave.open(path, "wb")
+            self.wav.setnchannels(mixer.channels)
+            self.wav.setsampwidth(2)
+            self.wav.setframerate(mixer.rate)
+        self.chunks = 0
+        self.fill_seconds = 0.0
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="audio", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        period = self.mixer.chunk / self.mixer.rate
+        deadline = time.perf_counter()
+        while self.running:
+            started = time.perf_counter()
+            output = self.mixer.fill()
+            self.fill_seconds += time.perf_counter() - started
+            self.chunks += 1
+            if self.wav is not None:
+                self.wav.writeframes(output.tobytes())
+            deadline += period
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+
+    def close(self):
+        self.running = False
+        self.thread.join()
+        if self.wav is not None:
+            self.wav.close()
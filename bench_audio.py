@@ -0,0 +1,73 @@
+# bench_audio.py
+import argparse
+import json
+import random
+import statistics
+import time
+import audiomix
+
+MUSIC = "assets/music.wav"
+EFFECT = "assets/eat.wav"
+
+
+def measure(chunk, triggers, path=None):
+    """Latency from play() to the effect leaving the sink, for one chunk size.
+
+    An effect is mixed into the first chunk pulled after play() and is
+    heard once that chunk has gone through the device buffer, one more
+    chunk, so latency is the wait for the next pull plus one chunk.
+    """
+    mixer = audiomix.Mixer(chunk=chunk)
+    mixer.set_music(audiomix.load_wav(MUSIC))
+    effect = audiomix.load_wav(EFFECT)
+    sink = audiomix.NullSink(mixer, path)
+    rng = random.Random(chunk)
+    try:
+        for _ in range(triggers):
+            # Off the chunk grid, as a game tick would be.
+            time.sleep(rng.uniform(0.02, 0.08))
+            mixer.play(effect)
+        time.sleep(2 * chunk / mixer.rate)
+    finally:
+        sink.close()
+    buffer_s = chunk / mixer.rate
+    latencies = sorted(mixed - played + buffer_s for played, mixed in mixer.starts)
+    return {
+        "chunk_frames": chunk,
+        "buffer_ms": buffer_s * 1000,
+        "triggers": len(latencies),
+        "latency_median_ms": statistics.median(latencies) * 1000,
+        "latency_p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        "latency_max_ms": latencies[-1] * 1000,
+        "mix_us_per_chunk": sink.fill_seconds / max(1, sink.chunks) * 1e6,
+    }
+
+
+def bench(args):
+    results = []
+    for chunk in args.chunks:
+        path = f"{args.wav}-{chunk}.wav" if args.wav else None
+        results.append(measure(chunk, args.triggers, path))
+    print(json.dumps(results, indent=4))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Effect latency of the in-process mixer, without a sound card"
+    )
+    parser.add_argument(
+        "--chunks",
+        type=lambda text: [int(n) for n in text.split(",")],
+        default=[1024, 512, 256, 128],
+        help="comma-separated callback sizes in frames; 1024 matches "
+        "pygame.mixer's buffer (default: 1024,512,256,128)",
+    )
+    parser.add_argument("--triggers", type=int, default=50, help="effects played")
+    parser.add_argument(
+        "--wav", help="also write each mix to WAV-CHUNK.wav, to listen to"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    bench(parse_args())
@@ -0,0 +1,59 @@
+# bench_env.py
+import argparse
+import json
+import time
+import numpy as np
+import env
+
+
+def bench(args):
+    """Step many environments with random actions and report steps per second."""
+    options = {"mode": args.mode, "level": args.level}
+    if args.workers:
+        envs = env.SubprocVectorSnakeEnv(
+            args.envs, workers=args.workers, seed=0, **options
+        )
+    else:
+        envs = env.VectorSnakeEnv(args.envs, seed=0, **options)
+    rng = np.random.default_rng(0)
+    # Pre-drawn actions keep the random number generator out of the timing.
+    actions = rng.integers(0, len(env.ACTIONS), size=(256, args.envs), dtype=np.uint8)
+    envs.reset()
+    steps = 0
+    episodes = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < args.seconds:
+        for batch in actions:
+            _, _, terminated, truncated, _ = envs.step(batch)
+            episodes += int(terminated.sum() + truncated.sum())
+        steps += len(actions) * args.envs
+    elapsed = time.perf_counter() - started
+    envs.close()
+    print(
+        json.dumps(
+            {
+                "envs": args.envs,
+                "workers": args.workers,
+                "steps": steps,
+                "episodes": episodes,
+                "steps_per_s": steps / elapsed,
+            },
+            indent=4,
+        )
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput test for env.py")
+    parser.add_argument("--envs", type=int, default=64)
+    parser.add_argument(
+        "--workers", type=int, default=0, help="use this many worker processes"
+    )
+    parser.add_argument("--mode", default="survival")
+    parser.add_argument("--level", default="Open")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    bench(parse_args())
@@ -0,0 +1,174 @@
+# bench_server.py
+import argparse
+import asyncio
+import json
+import time
+import levels
+import protocol
+from cluster import ShardedServer
+from multiplayer import DELTA_DEAD, DELTA_FOOD, DELTA_HEAD, DELTA_TAIL
+from server import GameServer
+from settings import SPEED_MAP
+
+
+class Pilot:
+    """Steer a client's snake from the server's deltas, like a player would.
+
+    It keeps going straight while the next cell is free and otherwise
+    turns into a free cell, preferring the one nearest the food, so
+    rounds last as long as real games instead of ending at the first wall.
+    """
+
+    def __init__(self, payload):
+        self.sid, width, height, rows = protocol.decode_welcome(payload)
+        self.level = levels.Level("remote", rows)
+        self.bodies = {}  # Snake id -> cells, tail first.
+        self.occupied = set()
+        self.direction = None  # Learnt from the head's first move.
+        self.food = None
+
+    def apply(self, payload):
+        for delta in protocol.decode_deltas(payload, protocol.TICK.size):
+            kind, sid = delta[0], delta[1]
+            if kind == DELTA_HEAD:
+                body = self.bodies.setdefault(sid, [])
+                if sid == self.sid and body:
+                    step = (delta[2] - body[-1][0], delta[3] - body[-1][1])
+                    if step in protocol.DIRECTIONS:  # Not a portal jump.
+                        self.direction = step
+                body.append(delta[2:])
+                self.occupied.add(delta[2:])
+            elif kind == DELTA_TAIL:
+                self.occupied.discard(self.bodies[sid].pop(0))
+            elif kind == DELTA_DEAD:
+                self.occupied.difference_update(self.bodies.pop(sid, []))
+            elif kind == DELTA_FOOD:
+                self.food = delta[2:]
+
+    def free(self, pos):
+        x, y = pos
+        if not (0 <= x < self.level.width and 0 <= y < self.level.height):
+            return False
+        cell = self.level.grid[self.level.index(pos)]
+        return cell != levels.WALL and pos not in self.occupied
+
+    def choose(self):
+        """A new direction to send, or None to keep going."""
+        body = self.bodies.get(self.sid)
+        if not body or self.direction is None:
+            return None
+        head = body[-1]
+        best = None
+        for direction in protocol.DIRECTIONS:
+            if direction == (-self.direction[0], -self.direction[1]):
+                continue
+            pos = (head[0] + direction[0], head[1] + direction[1])
+            if not self.free(pos):
+                continue
+            distance = 0
+            if self.food is not None:
+                distance = abs(pos[0] - self.food[0]) + abs(pos[1] - self.food[1])
+            if direction == self.direction:
+                distance -= 0.5  # Prefer going straight on ties.
+            if best is None or distance < best[0]:
+                best = (distance, direction)
+        if best is None or best[1] == self.direction:
+            return None
+        self.direction = best[1]
+        return best[1]
+
+
+async def watch(host, port, room, counts, delay):
+    """Join room after delay, then steer its snake and count ticks."""
+    await asyncio.sleep(delay)
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(protocol.encode_join(room))
+    pilot = None
+    try:
+        while True:
+            payload = await protocol.read_message(reader)
+            if payload[0] == protocol.MSG_WELCOME:
+                pilot = Pilot(payload)
+                if pilot.sid == protocol.NO_SNAKE:
+                    pilot = None
+            elif payload[0] == protocol.MSG_TICK:
+                counts["ticks"][room] = counts["ticks"].get(room, 0) + 1
+                if pilot is not None:
+                    pilot.apply(payload)
+                    direction = pilot.choose()
+                    if direction is not None:
+                        writer.write(protocol.encode_input(direction))
+            elif payload[0] == protocol.MSG_OVER:
+                counts["rounds"] += 1
+    except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+        writer.close()
+
+
+async def fetch_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(protocol.encode_stats_request())
+    payload = await protocol.read_message(reader)
+    writer.close()
+    return json.loads(payload[1:].decode("utf-8"))
+
+
+async def bench(args):
+    """Fill many rooms with one client and AI snakes, then report tick stats."""
+    if args.workers:
+        server = ShardedServer(workers=args.workers, bots=args.bots, speed=args.speed)
+    else:
+        server = GameServer(bots=args.bots, speed=args.speed)
+    listener = await server.start(args.host, args.port)
+    await asyncio.sleep(args.warmup)
+    # Joins are spread over one tick so the rooms do not all tick in phase.
+    tick = SPEED_MAP[args.speed]
+    counts = {"ticks": {}, "rounds": 0}
+    clients = [
+        asyncio.ensure_future(
+            watch(args.host, args.port, f"room{n}", counts, n * tick / args.rooms)
+        )
+        for n in range(args.rooms)
+    ]
+    await asyncio.sleep(tick + 1.0)  # Let every room start its first round.
+    counts["ticks"].clear()
+    counts["rounds"] = 0
+    started = time.time()
+    await asyncio.sleep(args.seconds)
+    elapsed = time.time() - started
+    ticks = sum(counts["ticks"].values())
+    rounds = counts["rounds"]
+    stats = await fetch_stats(args.host, args.port)
+    for client in clients:
+        client.cancel()
+    await asyncio.sleep(0.5)  # Let the server see every disconnect.
+    listener.close()
+    await listener.wait_closed()
+    stats["frames_received"] = ticks
+    stats["frames_per_s"] = ticks / elapsed
+    # Rooms tick 1 / delay times a second at most, less while between rounds.
+    stats["room_ticks_per_s"] = ticks / elapsed / args.rooms
+    stats["nominal_room_ticks_per_s"] = 1 / tick
+    stats["rounds_finished"] = rounds
+    stats["mean_round_ticks"] = ticks / rounds if rounds else None
+    print(json.dumps(stats, indent=4))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Localhost load test for server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7879)
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--bots", type=int, default=3)
+    parser.add_argument("--speed", default="Fast")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument(
+        "--workers", type=int, default=0, help="use cluster.py with this many workers"
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=0.0, help="seconds to wait for workers"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(parse_args()))
@@ -0,0 +1,140 @@
+# bench_startup.py
+import argparse
+import json
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+
+try:
+    import pty
+    import select
+except ImportError:  # Not available on Windows.
+    pty = None
+
+MARKER = b"Start Game"  # Shown once the main menu is drawn.
+# Queries a terminal library may send at startup, with minimal answers, so
+# the launch is not timed waiting for a reply a real terminal would send.
+REPLIES = [
+    (b"\x1b[6n", b"\x1b[1;1R"),  # Cursor position.
+    (b"\x1b[>q", b"\x1bP>|bench\x1b\\"),  # XTVERSION.
+    (b"\x1bP+q", b"\x1bP0+r\x1b\\"),  # XTGETTCAP: not supported.
+]
+
+
+def drop_caches():
+    """Evict the page cache so the next launch reads everything from disk.
+
+    Needs root on Linux; elsewhere the first launch stands in for a cold one.
+    """
+    try:
+        subprocess.run(["sync"], check=False)
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except OSError:
+        return False
+
+
+def launch(command, cwd, timeout):
+    """Seconds from starting command until the main menu appears, or None."""
+    environ = dict(os.environ, SDL_AUDIODRIVER="dummy")
+    started = time.perf_counter()
+    if pty is not None:
+        # A pseudo-terminal, so the game draws as it would for a player.
+        master, slave = pty.openpty()
+        proc = subprocess.Popen(
+            command, cwd=cwd, env=environ, stdin=slave, stdout=slave, stderr=slave
+        )
+        os.close(slave)
+        output = b""
+        try:
+            while MARKER not in output:
+                left = started + timeout - time.perf_counter()
+                if left <= 0 or not select.select([master], [], [], left)[0]:
+                    return None
+                try:
+                    chunk = os.read(master, 65536)
+                except OSError:  # The game exited.
+                    return None
+                output += chunk
+                for query, reply in REPLIES:
+                    os.write(master, reply * chunk.count(query))
+            return time.perf_counter() - started
+        finally:
+            proc.kill()
+            proc.wait()
+            os.close(master)
+    proc = subprocess.Popen(
+        command,
+        cwd=cwd,
+        env=environ,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    output = b""
+    try:
+        while MARKER not in output:
+            if time.perf_counter() - started > timeout:
+                return None
+            chunk = proc.stdout.read1(65536)
+            if not chunk:
+                return None
+            output += chunk
+        return time.perf_counter() - started
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def bench(args):
+    """Launch the game repeatedly and report cold and warm startup times."""
+    command = shlex.split(args.command) if args.command else [sys.executable, "main.py"]
+    cold_from_disk = args.drop_caches and drop_caches()
+    cold = launch(command, args.cwd, args.timeout)
+    warm = []
+    for _ in range(args.runs):
+        elapsed = launch(command, args.cwd, args.timeout)
+        if elapsed is not None:
+            warm.append(elapsed)
+    print(
+        json.dumps(
+            {
+                "command": command,
+                "cold_s": cold,
+                "cold_from_disk": cold_from_disk,
+                "warm_runs": len(warm),
+                "warm_median_s": statistics.median(warm) if warm else None,
+                "warm_min_s": min(warm) if warm else None,
+                "warm_max_s": max(warm) if warm else None,
+            },
+            indent=4,
+        )
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time from launch to the main menu, cold and warm"
+    )
+    parser.add_argument(
+        "--command",
+        help="what to launch, e.g. dist/SnakeGameAdventure/SnakeGameAdventure "
+        "(default: this Python running main.py)",
+    )
+    parser.add_argument("--cwd", default=".", help="directory to launch in")
+    parser.add_argument("--runs", type=int, default=10, help="warm launches")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--drop-caches",
+        action="store_true",
+        help="evict the page cache before the cold launch (Linux, root)",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    bench(parse_args())
@@ -0,0 +1,207 @@
+# bot.py
+import random
+import time
+from collections import deque
+import levels
+from state import DIRECTIONS, ItemType
+
+DEATH_PENALTY = 1000.0
+DISCOUNT = 0.95
+DISTANCE_WEIGHT = 1.0  # Leaf penalty per cell between the head and the food.
+ROLLOUT_DEPTH = 20
+
+
+class SearchState:
+    """The game's rules state with an undo log.
+
+    A search copies the board once per decision; every simulated move is
+    then applied in place and reverted from the log, so rollouts never copy
+    the snake or the grid.
+    """
+
+    def __init__(self, game, rng):
+        self.level = game.level
+        self.width = game.board_width
+        self.height = game.board_height
+        self.grid = bytearray(game.grid)
+        self.snake = deque(game.snake)
+        self.direction = game.direction
+        self.food = game.food
+        self.items = {pos: item.type for pos, item in game.power_items.items()}
+        config = game.config
+        self.wrap = config.wrap
+        self.points = (
+            config.food_points,
+            config.powerup_points,
+            config.powerdown_points,
+        )
+        self.rng = rng
+        self.log = []
+
+    def moves(self):
+        reverse = (-self.direction[0], -self.direction[1])
+        return [d for d in DIRECTIONS if d != reverse]
+
+    def target(self, direction):
+        """Return (cell index, position) the head would move to."""
+        x = self.snake[0][0] + direction[0]
+        y = self.snake[0][1] + direction[1]
+        if self.wrap:
+            x = (x - 1) % (self.width - 2) + 1
+            y = (y - 1) % (self.height - 2) + 1
+        idx = y * self.width + x
+        if self.grid[idx] == levels.PORTAL:
+            idx = self.level.portals[idx]
+            return idx, self.level.position(idx)
+        return idx, (x, y)
+
+    def is_safe(self, direction):
+        cell = self.grid[self.target(direction)[0]]
+        return cell == levels.FREE or cell == levels.PORTAL
+
+    def pop_tail(self):
+        x, y = self.snake.pop()
+        idx = y * self.width + x
+        self.grid[idx] = self.level.grid[idx]
+        return (x, y)
+
+    def push_tail(self, pos):
+        self.snake.append(pos)
+        self.grid[pos[1] * self.width + pos[0]] = levels.SNAKE
+
+    def step(self, direction):
+        """Apply one move; returns its reward, or None (unlogged) on death."""
+        idx, head = self.target(direction)
+        cell = self.grid[idx]
+        if cell != levels.FREE and cell != levels.PORTAL:
+            return None
+        food_points, powerup_points, powerdown_points = self.points
+        reward = 0
+        tail = shrunk = item = None
+        old_food = self.food
+        self.snake.appendleft(head)
+        self.grid[idx] = levels.SNAKE
+        if head == self.food:
+            reward += food_points
+            self.food = self.sample_food()
+        else:
+            tail = self.pop_tail()
+        item_type = self.items.pop(head, None)
+        if item_type is not None:
+            item = (head, item_type)
+            if item_type is ItemType.POWERUP:
+                reward += powerup_points
+            else:
+                reward -= powerdown_points
+                if len(self.snake) > 3:
+                    shrunk = self.pop_tail()
+        self.log.append((self.direction, idx, tail, shrunk, old_food, item))
+        self.direction = direction
+        return reward
+
+    def undo(self):
+        self.direction, idx, tail, shrunk, self.food, item = self.log.pop()
+        if shrunk is not None:
+            self.push_tail(shrunk)
+        if tail is not None:
+            self.push_tail(tail)
+        if item is not None:
+            self.items[item[0]] = item[1]
+        self.snake.popleft()
+        self.grid[idx] = self.level.grid[idx]
+
+    def sample_food(self):
+        # The real spawn is random, so rollouts sample one possible outcome.
+        free_cells = self.level.free_cells
+        for _ in range(64):
+            idx = self.rng.choice(free_cells)
+            if self.grid[idx] == levels.FREE:
+                pos = self.level.position(idx)
+                if pos not in self.items:
+                    return pos
+        return self.food
+
+
+class SearchBot:
+    """Flat Monte-Carlo search over the next move.
+
+    Every legal first move is tried in turn, followed by a short random
+    rollout biased towards food. The move with the best mean return wins.
+    The deadline is checked before every simulated step, so the search
+    never overruns its budget by more than a single move.
+    """
+
+    def __init__(self, budget=0.01, depth=ROLLOUT_DEPTH, seed=None):
+        self.budget = budget
+        self.depth = depth
+        self.rng = random.Random(seed)
+        self.rollouts = 0
+
+    def rollout_move(self, state):
+        safe = [d for d in state.moves() if state.is_safe(d)]
+        if not safe:
+            return None
+        if self.rng.random() < 0.5:
+            head_x, head_y = state.snake[0]
+            food_x, food_y = state.food
+            return min(
+                safe,
+                key=lambda d: abs(head_x + d[0] - food_x) + abs(head_y + d[1] - food_y),
+            )
+        return self.rng.choice(safe)
+
+    def rollout(self, state, deadline):
+        """Play random moves and undo them; None if the deadline hit first."""
+        total = 0.0
+        weight = DISCOUNT
+        steps = 0
+        clock = time.perf_counter
+        try:
+            for _ in range(self.depth):
+                if clock() >= deadline:
+                    return None
+                move = self.rollout_move(state)
+                reward = None if move is None else state.step(move)
+                if reward is None:
+                    return total - DEATH_PENALTY * weight
+                steps += 1
+                total += reward * weight
+                weight *= DISCOUNT
+            # Rollouts rarely reach distant food, so score how close they got.
+            head_x, head_y = state.snake[0]
+            distance = abs(head_x - state.food[0]) + abs(head_y - state.food[1])
+            return total - DISTANCE_WEIGHT * weight * distance
+        finally:
+            for _ in range(steps):
+                state.undo()
+
+    def choose(self, game, budget=None):
+        """Return the best direction found within the time budget."""
+        deadline = time.perf_counter() + (self.budget if budget is None else budget)
+        state = SearchState(game, self.rng)
+        totals = {}
+        counts = {}
+        for move in state.moves():
+            if state.is_safe(move):
+                totals[move] = 0.0
+                counts[move] = 0
+        if not totals:
+            return game.direction
+        while time.perf_counter() < deadline:
+            for move in totals:
+                if time.perf_counter() >= deadline:
+                    break
+                reward = state.step(move)
+                value = self.rollout(state, deadline)
+                state.undo()
+                if value is None:
+                    break
+                totals[move] += reward + value
+                counts[move] += 1
+                self.rollouts += 1
+        if not any(counts.values()) and game.direction in totals:
+            return game.direction  # Out of time before any rollout finished.
+        return max(
+            totals,
+            key=lambda m: totals[m] / counts[m] if counts[m] else float("-inf"),
+        )
@@ -0,0 +1,171 @@
+# client.py
+import argparse
+import asyncio
+from blessed import Terminal
+import levels
+import protocol
+import termcaps
+from multiplayer import (
+    DELTA_DEAD,
+    DELTA_FOOD,
+    DELTA_HEAD,
+    DELTA_ITEM,
+    DELTA_ITEM_GONE,
+    DELTA_SCORE,
+    DELTA_TAIL,
+    PLAYER_KEYS,
+    SNAKE_COLORS,
+)
+from server import DEFAULT_HOST, DEFAULT_PORT
+
+# The network client accepts both the arrow keys and W/A/S/D.
+CLIENT_KEYS = dict(PLAYER_KEYS[0], **PLAYER_KEYS[1])
+
+
+class BoardView:
+    """Client-side board rebuilt from the server's deltas.
+
+    Each delta is turned straight into a cursor move and a glyph, so the
+    terminal only ever receives the cells that changed.
+    """
+
+    def __init__(self, term):
+        self.term = term
+        self.level = None
+        self.sid = protocol.NO_SNAKE
+        self.bodies = {}
+        self.scores = {}
+        self.food = None
+        self.message = "Waiting for players..."
+        self.styles = termcaps.styles_for(term)
+        cells = [self.styles.snake_cells(color) for color in SNAKE_COLORS]
+        self.head_cells = [head for head, _ in cells]
+        self.body_cells = [body for _, body in cells]
+        self.food_cell = self.styles.food
+        self.item_cells = [self.styles.powerup, self.styles.powerdown]
+
+    def welcome(self, payload):
+        self.sid, width, height, rows = protocol.decode_welcome(payload)
+        self.level = levels.Level("remote", rows)
+        self.bodies = {}
+        self.scores = {}
+        self.food = None
+        self.message = "" if self.sid != protocol.NO_SNAKE else "Spectating"
+        parts = [self.term.home + self.term.clear]
+        for idx, cell in enumerate(self.level.grid):
+            x, y = self.level.position(idx)
+            if cell == levels.WALL:
+                glyph = self.level.wall_glyph(idx, self.styles.wall)
+                parts.append(self.term.move_xy(x, y) + glyph)
+            elif cell == levels.PORTAL:
+                parts.append(self.term.move_xy(x, y) + self.styles.portal)
+        return "".join(parts)
+
+    def empty_cell(self, x, y):
+        if self.level.grid[self.level.index((x, y))] == levels.PORTAL:
+            return self.styles.portal
+        return " "
+
+    def apply(self, payload):
+        """Apply a tick message and return the output for the changed cells."""
+        if self.level is None:
+            return ""
+        move_xy = self.term.move_xy
+        parts = []
+        for delta in protocol.decode_deltas(payload, protocol.TICK.size):
+            kind, sid = delta[0], delta[1]
+            if kind == DELTA_SCORE:
+                self.scores[sid] = delta[2]
+                continue
+            x, y = delta[2], delta[3]
+            if kind == DELTA_HEAD:
+                body = self.bodies.setdefault(sid, [])
+                if body:
+                    parts.append(move_xy(*body[-1]) + self.body_cells[sid])
+                body.append((x, y))
+                parts.append(move_xy(x, y) + self.head_cells[sid])
+            elif kind == DELTA_TAIL:
+                self.bodies[sid].pop(0)
+                parts.append(move_xy(x, y) + self.empty_cell(x, y))
+            elif kind == DELTA_DEAD:
+                for pos in self.bodies.pop(sid, []):
+                    parts.append(move_xy(*pos) + self.empty_cell(*pos))
+            elif kind == DELTA_FOOD:
+                self.food = (x, y)
+                parts.append(move_xy(x, y) + self.food_cell)
+            elif kind == DELTA_ITEM:
+                parts.append(move_xy(x, y) + self.item_cells[sid])
+            elif kind == DELTA_ITEM_GONE:
+                pass  # The head that collected it has already been drawn.
+        parts.append(self.status_line())
+        return "".join(parts)
+
+    def status_line(self):
+        scores = " | ".join(
+            f"{'You' if sid == self.sid else f'P{sid + 1}'}: {score}"
+            for sid, score in sorted(self.scores.items())
+        )
+        line = f"{scores} {self.message}".strip()
+        return self.term.move_xy(0, self.level.height) + line + self.term.clear_eol
+
+
+async def read_keys(term, writer):
+    loop = asyncio.get_running_loop()
+    while True:
+        inp = await loop.run_in_executor(None, term.inkey, 0.05)
+        key = inp.name if inp and inp.is_sequence else inp
+        if key in ("q", "Q"):
+            return
+        if key in CLIENT_KEYS:
+            writer.write(protocol.encode_input(CLIENT_KEYS[key]))
+
+
+async def read_frames(reader, view):
+    while True:
+        try:
+            payload = await protocol.read_message(reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        kind = payload[0]
+        if kind == protocol.MSG_WELCOME:
+            output = view.welcome(payload)
+        elif kind == protocol.MSG_TICK:
+            output = view.apply(payload)
+        elif kind == protocol.MSG_OVER:
+            winner = payload[1]
+            view.message = "You win!" if winner == view.sid else f"P{winner + 1} wins!"
+            output = view.status_line()
+        else:
+            continue
+        print(output, end="", flush=True)
+
+
+async def play(host, port, room):
+    term = Terminal()
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(protocol.encode_join(room))
+    view = BoardView(term)
+    with term.cbreak(), term.hidden_cursor():
+        keys = asyncio.ensure_future(read_keys(term, writer))
+        frames = asyncio.ensure_future(read_frames(reader, view))
+        await asyncio.wait([keys, frames], return_when=asyncio.FIRST_COMPLETED)
+        for task in (keys, frames):
+            task.cancel()
+    writer.close()
+    print(term.normal + term.move_xy(0, term.height - 1))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Snake Game Adventure client")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--room", default="lobby")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        asyncio.run(play(args.host, args.port, args.room))
+    except (KeyboardInterrupt, ConnectionError, asyncio.IncompleteReadError):
+        print("\nDisconnected.")
@@ -0,0 +1,322 @@
+# cluster.py
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import time
+import zlib
+from rich.console import Console
+import protocol
+from server import GameServer, build_parser
+
+console = Console()
+
+HEARTBEAT_INTERVAL = 1.0
+HEARTBEAT_TIMEOUT = 3.0  # Workers silent for longer than this are restarted.
+OVERLOAD_LATE_MS = 20.0  # Workers ticking this late get no new rooms.
+REBALANCE_SLACK = 1.25  # How much busier than the idlest worker a hash may be.
+ROOM_GRACE = 2 * HEARTBEAT_INTERVAL  # Time a new room has to show up in reports.
+CONTROL_BUFFER = 64 * 1024
+
+
+def worker_main(index, control, options):
+    """Entry point of a worker process."""
+    try:
+        asyncio.run(run_worker(index, control, options))
+    except KeyboardInterrupt:
+        pass
+
+
+async def run_worker(index, control, options):
+    """Host the rooms whose connections the acceptor hands over.
+
+    Client sockets arrive over the control socket as SCM_RIGHTS messages
+    carrying the room name; heartbeats go back the other way.
+    """
+    loop = asyncio.get_running_loop()
+    server = GameServer(**options)
+    control.setblocking(False)
+    closed = loop.create_future()
+
+    def receive_handoff():
+        try:
+            message, fds, _, _ = socket.recv_fds(control, CONTROL_BUFFER, 1)
+        except BlockingIOError:
+            return
+        except OSError:
+            message, fds = b"", []
+        if not message and not fds:
+            if not closed.done():
+                closed.set_result(None)  # The acceptor has gone away.
+            return
+        for fd in fds:
+            client = socket.socket(fileno=fd)
+            asyncio.ensure_future(adopt(server, client, message.decode("utf-8")))
+
+    loop.add_reader(control.fileno(), receive_handoff)
+    while not closed.done():
+        summary = server.summary()
+        summary["worker"] = index
+        summary["pid"] = os.getpid()
+        summary["room_names"] = list(server.rooms)
+        try:
+            control.send(json.dumps(summary).encode("utf-8"))
+        except BlockingIOError:
+            pass
+        except OSError:
+            break
+        await asyncio.wait([closed], timeout=HEARTBEAT_INTERVAL)
+
+
+async def adopt(server, client, room_name):
+    reader, writer = await asyncio.open_connection(sock=client)
+    await server.handle_client(reader, writer, room_name)
+
+
+class Worker:
+    """Acceptor-side handle on one worker process."""
+
+    def __init__(self, index, options):
+        self.index = index
+        self.options = options
+        self.process = None
+        self.control = None
+        self.summary = {}
+        self.last_seen = 0.0
+        self.rooms = {}  # Room name -> time it was assigned here.
+
+    def start(self, context):
+        self.control, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        self.process = context.Process(
+            target=worker_main, args=(self.index, child, self.options), daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.control.setblocking(False)
+        self.summary = {}
+        self.rooms = {}
+        self.last_seen = time.monotonic()
+
+    def stop(self):
+        if self.control is not None:
+            self.control.close()
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1)
+
+    @property
+    def healthy(self):
+        return (
+            self.process is not None
+            and self.process.is_alive()
+            and time.monotonic() - self.last_seen < HEARTBEAT_TIMEOUT
+        )
+
+    @property
+    def overloaded(self):
+        return self.summary.get("late_p99_ms", 0.0) > OVERLOAD_LATE_MS
+
+    def handoff(self, client, room_name):
+        socket.send_fds(self.control, [room_name.encode("utf-8")], [client.fileno()])
+
+
+class ShardedServer:
+    """Front acceptor that hashes rooms onto a pool of worker processes.
+
+    A room always lives on a single worker. New rooms go to the worker
+    their name hashes to unless it is unhealthy, overloaded, or much busier
+    than the idlest worker, in which case the idlest worker takes them.
+    """
+
+    def __init__(self, workers=None, **options):
+        self.context = multiprocessing.get_context("spawn")
+        count = workers or os.cpu_count() or 1
+        self.workers = [Worker(index, options) for index in range(count)]
+        self.assignments = {}  # Room name -> Worker.
+        self.listener = None
+        self.tasks = []
+
+    def watch(self, worker):
+        loop = asyncio.get_running_loop()
+        loop.add_reader(worker.control.fileno(), self.receive_heartbeat, worker)
+
+    def receive_heartbeat(self, worker):
+        try:
+            data = worker.control.recv(CONTROL_BUFFER)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            asyncio.get_running_loop().remove_reader(worker.control.fileno())
+            return
+        summary = json.loads(data.decode("utf-8"))
+        live = set(summary.pop("room_names"))
+        now = time.monotonic()
+        # Throughput over the last heartbeat interval rather than since start.
+        if worker.summary:
+            elapsed = max(now - worker.last_seen, 1e-9)
+            ticks = summary["ticks"] - worker.summary["ticks"]
+            summary["ticks_per_s"] = max(ticks, 0) / elapsed
+        for name, assigned in list(worker.rooms.items()):
+            if name not in live and now - assigned > ROOM_GRACE:
+                del worker.rooms[name]
+                if self.assignments.get(name) is worker:
+                    del self.assignments[name]
+        worker.summary = summary
+        worker.last_seen = now
+
+    def place(self, room_name):
+        """Pick the worker for a room, reusing its current one if healthy."""
+        worker = self.assignments.get(room_name)
+        if worker is not None and worker.healthy:
+            return worker
+        healthy = [w for w in self.workers if w.healthy]
+        candidates = [w for w in healthy if not w.overloaded] or healthy
+        if not candidates:
+            return None
+        index = zlib.crc32(room_name.encode("utf-8")) % len(self.workers)
+        worker = self.workers[index]
+        idlest = min(candidates, key=lambda w: len(w.rooms))
+        if (
+            worker not in candidates
+            or len(worker.rooms) > len(idlest.rooms) * REBALANCE_SLACK + 1
+        ):
+            worker = idlest
+        self.assignments[room_name] = worker
+        worker.rooms[room_name] = time.monotonic()
+        return worker
+
+    async def recv_exactly(self, client, size):
+        loop = asyncio.get_running_loop()
+        data = b""
+        while len(data) < size:
+            chunk = await loop.sock_recv(client, size - len(data))
+            if not chunk:
+                raise ConnectionError("client closed the connection")
+            data += chunk
+        return data
+
+    async def route(self, client):
+        """Read the JOIN message, then pass the socket to the room's worker.
+
+        Only the bytes of that first message are read so nothing meant for
+        the worker is left behind in the acceptor.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                header = await self.recv_exactly(client, protocol.HEADER.size)
+                (length,) = protocol.HEADER.unpack(header)
+                payload = await self.recv_exactly(client, length)
+                if payload[:1] == bytes([protocol.MSG_STATS]):
+                    reply = protocol.encode_stats_reply(self.summary())
+                    await loop.sock_sendall(client, reply)
+                elif payload[:1] == bytes([protocol.MSG_JOIN]):
+                    room_name = protocol.decode_join(payload)
+                    worker = self.place(room_name)
+                    if worker is not None:
+                        worker.handoff(client, room_name)
+                    return
+        except ConnectionError:
+            pass
+        except OSError as e:
+            console.print(f"[yellow]Dropped connection: {e}[/yellow]")
+        except ValueError as e:
+            console.print(f"[yellow]Dropped client sending a bad message: {e}[/yellow]")
+        finally:
+            client.close()
+
+    async def accept(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            client, _ = await loop.sock_accept(self.listener)
+            client.setblocking(False)
+            asyncio.ensure_future(self.route(client))
+
+    async def monitor(self):
+        """Restart workers that died or stopped sending heartbeats."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            for worker in self.workers:
+                if worker.healthy:
+                    continue
+                console.print(f"[yellow]Restarting worker {worker.index}[/yellow]")
+                loop.remove_reader(worker.control.fileno())
+                worker.stop()
+                for name in list(worker.rooms):
+                    self.assignments.pop(name, None)
+                worker.start(self.context)
+                self.watch(worker)
+
+    def summary(self):
+        workers = [dict(w.summary, healthy=w.healthy) for w in self.workers]
+        return {
+            "workers": workers,
+            "rooms": sum(w.get("rooms", 0) for w in workers),
+            "clients": sum(w.get("clients", 0) for w in workers),
+            "ticks": sum(w.get("ticks", 0) for w in workers),
+            "ticks_per_s": sum(w.get("ticks_per_s", 0.0) for w in workers),
+            "tick_p99_ms": max((w.get("tick_p99_ms", 0.0) for w in workers), default=0),
+            "late_p99_ms": max((w.get("late_p99_ms", 0.0) for w in workers), default=0),
+        }
+
+    async def start(self, host, port):
+        self.listener = socket.create_server((host, port), reuse_port=False)
+        self.listener.setblocking(False)
+        for worker in self.workers:
+            worker.start(self.context)
+            self.watch(worker)
+        self.tasks = [
+            asyncio.ensure_future(self.accept()),
+            asyncio.ensure_future(self.monitor()),
+        ]
+        return self
+
+    def close(self):
+        loop = asyncio.get_running_loop()
+        for task in self.tasks:
+            task.cancel()
+        for worker in self.workers:
+            loop.remove_reader(worker.control.fileno())
+            worker.stop()
+        self.listener.close()
+
+    async def wait_closed(self):
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+async def serve(args):
+    server = ShardedServer(
+        workers=args.workers, bots=args.bots, speed=args.speed, level=args.level
+    )
+    await server.start(args.host, args.port)
+    console.print(
+        f"[green]Snake cluster listening on {args.host}:{args.port} "
+        f"with {len(server.workers)} workers[/green]"
+    )
+    try:
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            summary = server.summary()
+            console.print(
+                f"rooms={summary['rooms']} clients={summary['clients']} "
+                f"ticks/s={summary['ticks_per_s']:.0f} "
+                f"p99={summary['tick_p99_ms']:.3f}ms "
+                f"late_p99={summary['late_p99_ms']:.3f}ms"
+            )
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    parser = build_parser()
+    parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes (default: CPUs)"
+    )
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
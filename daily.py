@@ -0,0 +1,81 @@
+# daily.py
+import datetime
+import hashlib
+import math
+import random
+from array import array
+from state import ItemType
+
+SCHEDULE_LENGTH = 1024  # Spawns worked out per kind; longer runs start over.
+POWER_CHANCE = 0.1  # Per tick without a power item, as in normal games.
+POWER_TYPES = [ItemType.POWERUP, ItemType.POWERDOWN]
+LEADERBOARD_SIZE = 10
+LEADERBOARD_DAYS = 30  # Days of leaderboards kept in the score file.
+
+
+def today():
+    return datetime.date.today().isoformat()
+
+
+def daily_seed(day):
+    """A seed for an ISO date that is the same on every machine and Python."""
+    digest = hashlib.sha256(f"snake-daily-{day}".encode("ascii")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class DailySchedule:
+    """Every food and power item spawn of a day's challenge, drawn at game start.
+
+    food holds the spawn cells in order as indices into level.free_cells.
+    powers holds three entries per power item: the ticks without a power
+    item before it appears, its type and its cell. Both are 16-bit arrays,
+    so a day's schedule takes about 8 KB and a spawn in the tick is an
+    array lookup. A scheduled cell that is taken falls back to the next
+    free cell in level order, so every player sees the same fallback.
+    """
+
+    def __init__(self, day, level):
+        rng = random.Random(daily_seed(day))
+        cells = len(level.free_cells)
+        self.level = level
+        self.food = array("H", (rng.randrange(cells) for _ in range(SCHEDULE_LENGTH)))
+        self.powers = array("H")
+        log_miss = math.log(1.0 - POWER_CHANCE)
+        for _ in range(SCHEDULE_LENGTH):
+            # Ticks until a roll of POWER_CHANCE succeeds, drawn all at once.
+            wait = int(math.log(1.0 - rng.random()) / log_miss)
+            self.powers.extend(
+                (
+                    min(wait, 0xFFFF),
+                    rng.randrange(len(POWER_TYPES)),
+                    rng.randrange(cells),
+                )
+            )
+        self.next_food = 0
+        self.next_power = 0
+        self.wait = self.powers[0]
+
+    def cell(self, slot, taken):
+        """The grid index of free cell slot, or of the next one not taken."""
+        free_cells = self.level.free_cells
+        for step in range(len(free_cells)):
+            idx = free_cells[(slot + step) % len(free_cells)]
+            if not taken(idx):
+                return idx
+        return free_cells[slot]
+
+    def spawn_food(self, taken):
+        slot = self.food[self.next_food % SCHEDULE_LENGTH]
+        self.next_food += 1
+        return self.cell(slot, taken)
+
+    def spawn_power(self, taken):
+        """(type, grid index) if a power item is due this tick, else None."""
+        if self.wait:
+            self.wait -= 1
+            return None
+        offset = (self.next_power % SCHEDULE_LENGTH) * 3
+        self.next_power += 1
+        self.wait = self.powers[(offset + 3) % len(self.powers)]
+        kind, slot = self.powers[offset + 1], self.powers[offset + 2]
+        return POWER_TYPES[kind], self.cell(slot, taken)
@@ -0,0 +1,331 @@
+# env.py
+import copy
+import gc
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+import numpy as np
+import levels
+from game import SnakeGame
+from settings import DEFAULT_SETTINGS
+from state import DIRECTIONS, ItemType
+
+# Action n is the absolute direction DIRECTIONS[n]; turning back onto the
+# body is ignored.
+ACTIONS = DIRECTIONS
+MAX_STEPS = 2000
+COLLISION_REWARD = -10.0
+
+# Observation cell codes. The first four match the level and snake codes in
+# the game's collision grid, so that grid can be copied in directly.
+OBS_FREE = levels.FREE
+OBS_WALL = levels.WALL
+OBS_PORTAL = levels.PORTAL
+OBS_BODY = levels.SNAKE
+OBS_HEAD = 4
+OBS_FOOD = 5
+OBS_POWERUP = 6
+OBS_POWERDOWN = 7
+ITEM_CODES = {ItemType.POWERUP: OBS_POWERUP, ItemType.POWERDOWN: OBS_POWERDOWN}
+
+
+class TrainingGame(SnakeGame):
+    """A silent SnakeGame where every collision ends the episode."""
+
+    def __init__(self, settings, mode):
+        super().__init__(settings, mode=mode)
+        self.sound = False
+
+    def handle_collision(self):
+        self.stats.collisions += 1
+        self.game_over = True
+
+
+class SnakeEnv:
+    """Gym-style environment running the game's own rules.
+
+    The observation is a (height, width) uint8 array of cell codes. It is
+    allocated once and patched in place after every step, so callers that
+    keep an observation around must copy it. Game time advances by the
+    current tick delay per step, which drives the time_attack limit.
+    """
+
+    def __init__(
+        self,
+        mode="survival",
+        level=levels.DEFAULT_LEVEL,
+        wrap=False,
+        max_steps=MAX_STEPS,
+        seed=None,
+    ):
+        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        settings["5"]["value"] = wrap
+        settings["9"]["value"] = level
+        settings["11"]["value"] = "Off"
+        self.game = TrainingGame(settings, mode)
+        self.game.clock = self.clock
+        self.elapsed = 0.0
+        self.steps = 0
+        self.max_steps = max_steps
+        self.width = self.game.board_width
+        self.height = self.game.board_height
+        self.attach(bytearray(self.width * self.height))
+        self.reset(seed)
+
+    def clock(self):
+        return self.elapsed
+
+    def attach(self, buffer):
+        """Write observations into buffer, e.g. a slice of a shared array."""
+        self.cells = memoryview(buffer)
+        self.observation = np.frombuffer(self.cells, dtype=np.uint8).reshape(
+            self.height, self.width
+        )
+        self.render_cells()
+
+    def render_cells(self):
+        game = self.game
+        cells = self.cells
+        width = self.width
+        cells[:] = game.grid
+        head_x, head_y = game.snake[0]
+        cells[head_y * width + head_x] = OBS_HEAD
+        cells[game.food[1] * width + game.food[0]] = OBS_FOOD
+        for (x, y), item in game.power_items.items():
+            cells[y * width + x] = ITEM_CODES[item.type]
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.game.rng.seed(seed)
+        self.elapsed = 0.0
+        self.steps = 0
+        self.game.reset_game(initial=True)
+        self.render_cells()
+        return self.observation, {}
+
+    def step(self, action):
+        """Returns (observation, reward, terminated, truncated, info)."""
+        game = self.game
+        direction = ACTIONS[action]
+        if direction != (-game.direction[0], -game.direction[1]):
+            game.direction = direction
+        snake = game.snake
+        old_head = snake[0]
+        old_tail = snake[-2:]  # A power-down can remove two segments.
+        score = game.score
+        self.elapsed += game.delay
+        self.steps += 1
+        game.update()
+        truncated = self.steps >= self.max_steps
+        if game.game_over and not game.time_up:
+            return self.observation, COLLISION_REWARD, True, truncated, {}
+        # Only the cells around the head, the tail and new items can change.
+        cells = self.cells
+        grid = game.grid
+        width = self.width
+        for x, y in old_tail:
+            idx = y * width + x
+            cells[idx] = grid[idx]
+        cells[old_head[1] * width + old_head[0]] = OBS_BODY
+        head_x, head_y = snake[0]
+        cells[head_y * width + head_x] = OBS_HEAD
+        cells[game.food[1] * width + game.food[0]] = OBS_FOOD
+        for (x, y), item in game.power_items.items():
+            cells[y * width + x] = ITEM_CODES[item.type]
+        return self.observation, game.score - score, game.game_over, truncated, {}
+
+
+class VectorSnakeEnv:
+    """Step several SnakeEnvs together with preallocated batch arrays.
+
+    All observations live in one (num_envs, height, width) array that each
+    environment patches in place. Finished environments are reset
+    automatically, so the returned observation is already the first one of
+    the next episode.
+    """
+
+    def __init__(self, num_envs, seed=None, buffer=None, **options):
+        self.num_envs = num_envs
+        self.envs = [
+            SnakeEnv(seed=None if seed is None else seed + i, **options)
+            for i in range(num_envs)
+        ]
+        height = self.envs[0].height
+        width = self.envs[0].width
+        size = height * width
+        if buffer is None:
+            buffer = bytearray(num_envs * size)
+        view = memoryview(buffer)
+        self.observations = np.frombuffer(view, dtype=np.uint8).reshape(
+            num_envs, height, width
+        )
+        for i, env in enumerate(self.envs):
+            env.attach(view[i * size : (i + 1) * size])
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+
+    def reset(self, seed=None):
+        for i, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + i)
+        return self.observations, {}
+
+    def step(self, actions):
+        if isinstance(actions, np.ndarray):
+            actions = actions.tolist()
+        rewards = []
+        terminated = []
+        truncated = []
+        for env, action in zip(self.envs, actions):
+            _, reward, done, cut, _ = env.step(action)
+            if done or cut:
+                env.reset()
+            rewards.append(reward)
+            terminated.append(done)
+            truncated.append(cut)
+        self.rewards[:] = rewards
+        self.terminated[:] = terminated
+        self.truncated[:] = truncated
+        return self.observations, self.rewards, self.terminated, self.truncated, {}
+
+    def close(self):
+        pass
+
+
+def shared_arrays(buf, num_envs):
+    """Rewards, terminated, truncated and actions inside one shared block."""
+    return (
+        np.ndarray((num_envs,), dtype=np.float32, buffer=buf),
+        np.ndarray((num_envs,), dtype=bool, buffer=buf, offset=4 * num_envs),
+        np.ndarray((num_envs,), dtype=bool, buffer=buf, offset=5 * num_envs),
+        np.ndarray((num_envs,), dtype=np.uint8, buffer=buf, offset=6 * num_envs),
+    )
+
+
+def worker_main(conn, names, num_envs, start, stop, seed, options):
+    """Entry point of a SubprocVectorSnakeEnv worker process."""
+    observations = shared_memory.SharedMemory(name=names[0])
+    results = shared_memory.SharedMemory(name=names[1])
+    arrays = shared_arrays(results.buf, num_envs)
+    rewards, terminated, truncated, actions = arrays
+    envs = None
+    try:
+        height, width = options.pop("shape")
+        size = height * width
+        envs = VectorSnakeEnv(
+            stop - start,
+            seed=None if seed is None else seed + start,
+            buffer=observations.buf[start * size : stop * size],
+            **options,
+        )
+        conn.send_bytes(b"r")
+        while True:
+            command = conn.recv_bytes()
+            if command == b"s":
+                envs.step(actions[start:stop])
+                rewards[start:stop] = envs.rewards
+                terminated[start:stop] = envs.terminated
+                truncated[start:stop] = envs.truncated
+            elif command == b"r":
+                envs.reset()
+            else:
+                break
+            conn.send_bytes(b"k")
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        # Views must be gone before the shared blocks can be closed, and
+        # each env and its game refer to each other.
+        del rewards, terminated, truncated, actions, arrays, envs
+        gc.collect()
+        observations.close()
+        results.close()
+
+
+class SubprocVectorSnakeEnv:
+    """A VectorSnakeEnv split across worker processes.
+
+    Observations, rewards, flags and actions all live in shared memory, so
+    a step only sends each worker a one-byte command and waits for a
+    one-byte reply.
+    """
+
+    def __init__(self, num_envs, workers=None, seed=None, **options):
+        level = levels.load_level(options.get("level", levels.DEFAULT_LEVEL))
+        height, width = level.height, level.width
+        self.num_envs = num_envs
+        self.observation_block = shared_memory.SharedMemory(
+            create=True, size=num_envs * height * width
+        )
+        self.result_block = shared_memory.SharedMemory(create=True, size=7 * num_envs)
+        self.observations = np.ndarray(
+            (num_envs, height, width),
+            dtype=np.uint8,
+            buffer=self.observation_block.buf,
+        )
+        (
+            self.rewards,
+            self.terminated,
+            self.truncated,
+            self.actions,
+        ) = shared_arrays(self.result_block.buf, num_envs)
+        workers = max(1, min(workers or os.cpu_count() or 1, num_envs))
+        context = multiprocessing.get_context("spawn")
+        names = (self.observation_block.name, self.result_block.name)
+        self.connections = []
+        self.processes = []
+        bounds = [num_envs * i // workers for i in range(workers + 1)]
+        for start, stop in zip(bounds, bounds[1:]):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=worker_main,
+                args=(
+                    child,
+                    names,
+                    num_envs,
+                    start,
+                    stop,
+                    seed,
+                    dict(options, shape=(height, width)),
+                ),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+        for conn in self.connections:
+            conn.recv_bytes()  # Ready.
+
+    def command(self, command):
+        for conn in self.connections:
+            conn.send_bytes(command)
+        for conn in self.connections:
+            conn.recv_bytes()
+
+    def reset(self):
+        self.command(b"r")
+        return self.observations, {}
+
+    def step(self, actions):
+        self.actions[:] = actions
+        self.command(b"s")
+        return self.observations, self.rewards, self.terminated, self.truncated, {}
+
+    def close(self):
+        for conn in self.connections:
+            try:
+                conn.send_bytes(b"q")
+            except OSError:
+                pass
+            conn.close()
+        for process in self.processes:
+            process.join(timeout=5)
+        self.connections = []
+        self.processes = []
+        del self.observations, self.rewards, self.terminated, self.truncated
+        del self.actions
+        self.observation_block.close()
+        self.observation_block.unlink()
+        self.result_block.close()
+        self.result_block.unlink()
@@ -5,34 +5,97 @@ import time
 from blessed import Terminal
 from rich.console import Console
 import audio
+import bot
+import daily
+import levels
+import metrics
+import recorder
+import snapshot
+import termcaps
+import themes
+from settings import GameConfig
+from state import GameStats, ItemType, PowerItem
 
 console = Console()
 
-SPEED_MAP = {"Slow": 0.2, "Normal": 0.1, "Fast": 0.05}
+terminal = None
+
+
+def shared_terminal():
+    """The process-wide Terminal; each new one reloads the terminfo database."""
+    global terminal
+    if terminal is None:
+        terminal = Terminal()
+    return terminal
 
 
 class SnakeGame:
     """Main Snake game logic."""
 
-    def __init__(self, settings, mode="classic", achievements_manager=None):
-        self.term = Terminal()
+    def __init__(
+        self,
+        settings,
+        mode="classic",
+        achievements_manager=None,
+        broadcaster=None,
+        config=None,
+    ):
+        self.term = shared_terminal()
         self.settings = settings
-        self.mode = mode  # "classic", "time_attack", "survival"
+        self.mode = mode  # "classic", "time_attack", "survival", "daily"
+        self.config = config or GameConfig(settings, mode)
+        self.sound = True  # Headless engines (e.g. the server) turn this off.
+        self.clock = time.time  # Game time; simulations substitute their own.
+        self.turbo = False  # See enable_turbo().
+        self.render_every = 1
+        self.inputs = None
+        self.game_time = 0.0
+        self.frame = 0
+        self.level = levels.load_level(self.config.level)
+        self.board_width = self.level.width
+        self.board_height = self.level.height
+        self.rng = random.Random()
+        self.schedule = None  # A daily.DailySchedule in a daily challenge.
+        # Lookahead search, either steering the snake or suggesting a move.
+        self.bot = None
+        if self.config.assist != "Off":
+            self.bot = bot.SearchBot(budget=self.config.think_time)
+        self.autopilot = self.config.assist == "Autopilot"
+        self.new_game(achievements_manager, broadcaster, self.config)
+        self.reset_game(initial=True)
+
+    def new_game(self, achievements_manager=None, broadcaster=None, config=None):
+        """Reset what lasts a whole game, so a pooled engine can be reused.
+
+        config is the game's GameConfig if the caller already compiled it;
+        otherwise it is compiled here, as settings may have changed since
+        the last game on this engine.
+        """
+        self.config = config or GameConfig(self.settings, self.mode)
         self.achievements_manager = achievements_manager
-        self.board_width = 40
-        self.board_height = 20
-        # Appearance of game elements
-        self.snake_char = "■"
-        self.snake_head_char = "●"
-        self.food_char = "♥"
-        self.powerup_char = "♦"
-        self.powerdown_char = "▲"
+        self.broadcaster = broadcaster  # Optional spectate.Broadcaster.
+        self.recorder = None  # A recorder.Recorder while recording is on.
+        # Styled cells come from a table built once per terminal.
+        self.styles = termcaps.styles_for(self.term)
+        self.item_cells = {
+            ItemType.POWERUP: self.styles.powerup,
+            ItemType.POWERDOWN: self.styles.powerdown,
+        }
+        self.load_theme()
         self.consecutive_food = 0
         self.achievements_unlocked = set()
+        self.suspended = False
+        self.hint = None
         if self.mode == "classic":
             self.lives = 3
             self.cumulative_score = 0
-        self.reset_game(initial=True)
+
+    def load_theme(self):
+        """Look up the precomputed animation frames for the theme and level."""
+        self.theme = themes.theme_frames(
+            self.term, self.styles, self.config.theme, self.level
+        )
+        self.theme_frame = None
 
     def reset_game(self, initial=False):
         if self.mode == "classic" and not initial:
@@ -41,7 +104,7 @@ class SnakeGame:
             self.score = 0
             if self.mode == "classic":
                 self.cumulative_score = 0
-        self.start_time = time.time()
+        self.start_time = self.clock()
         self.time_up = False
         if self.mode == "time_attack":
             self.time_limit = 60
@@ -53,32 +116,85 @@ class SnakeGame:
             (start_x - 2, start_y),
         ]
         self.direction = (1, 0)
-        self.food = self.spawn_item(exclude=self.snake)
-        self.power_items = []
-        # Additional stats
-        self.food_eaten = 0
-        self.powerups_collected = 0
-        self.powerdowns_collected = 0
-        self.max_length = len(self.snake)
-        self.collisions = 0
-        difficulty = self.settings.get("7", {"value": "Normal"})["value"]
-        factor = {"Easy": 1.2, "Normal": 1.0, "Hard": 0.8}.get(difficulty, 1.0)
-        self.delay = SPEED_MAP[self.settings["2"]["value"]] * factor
+        # Static level cells plus the snake; one lookup answers any collision.
+        self.grid = bytearray(self.level.grid)
+        for pos in self.snake:
+            self.grid[self.level.index(pos)] = levels.SNAKE
+        self.food = None
+        self.power_items = {}  # Position -> PowerItem.
+        # A daily challenge takes its spawns from the day's schedule.
+        self.schedule = None
+        if self.config.day is not None:
+            self.schedule = daily.DailySchedule(self.config.day, self.level)
+        self.food = self.spawn_item()
+        self.screen = None  # Forces a full redraw on the next frame.
+        self.stats = GameStats(max_length=len(self.snake))
+        self.delay = self.initial_delay()
         self.game_over = False
         self.consecutive_food = 0
 
-    def spawn_item(self, exclude):
+    def initial_delay(self):
+        return self.config.delay
+
+    def taken(self, idx):
+        """Whether cell idx holds a wall, snake, food or power item."""
+        if self.grid[idx] != levels.FREE:
+            return True
+        pos = self.level.position(idx)
+        return pos == self.food or pos in self.power_items
+
+    def spawn_item(self):
+        """Pick a random free cell that holds no snake, food or power item."""
+        if self.schedule is not None:
+            return self.level.position(self.schedule.spawn_food(self.taken))
+        free_cells = self.level.free_cells
         while True:
-            x = random.randint(1, self.board_width - 2)
-            y = random.randint(1, self.board_height - 2)
-            if (x, y) not in exclude:
-                return (x, y)
+            idx = self.rng.choice(free_cells)
+            if not self.taken(idx):
+                return self.level.position(idx)
 
     def maybe_spawn_power_item(self):
-        if len(self.power_items) < 1 and random.random() < 0.1:
-            item_type = random.choice(["powerup", "powerdown"])
-            pos = self.spawn_item(exclude=self.snake + [self.food])
-            self.power_items.append({"pos": pos, "type": item_type})
+        """Maybe place a power item; returns the new item or None."""
+        if len(self.power_items) >= 1:
+            return None
+        if self.schedule is not None:
+            spawn = self.schedule.spawn_power(self.taken)
+            if spawn is None:
+                return None
+            item_type, idx = spawn
+            pos = self.level.position(idx)
+        elif self.rng.random() < 0.1:
+            item_type = self.rng.choice([ItemType.POWERUP, ItemType.POWERDOWN])
+            pos = self.spawn_item()
+        else:
+            return None
+        item = self.power_items[pos] = PowerItem(pos, item_type)
+        return item
+
+    def play_sound(self, sound_file):
+        if self.sound:
+            audio.play_sound(sound_file)
+
+    def remove_tail(self):
+        tail = self.level.index(self.snake.pop())
+        self.grid[tail] = self.level.grid[tail]
+
+    def handle_collision(self):
+        if self.mode != "classic":
+            self.game_over = True
+            return
+        self.stats.collisions += 1
+        if self.lives > 1:
+            self.lives -= 1
+            self.cumulative_score = self.score
+            if not self.turbo:
+                console.print(
+                    f"[yellow]Life lost! Lives remaining: {self.lives}[/yellow]"
+                )
+                time.sleep(1)
+            self.reset_game()
+        else:
+            self.game_over = True
 
     def process_input(self, key):
         mapping = {
@@ -93,38 +209,13 @@ class SnakeGame:
         }
         if key in mapping:
             candidate = mapping[key]
-            if self.settings["4"]["value"]:
+            if self.config.invert:
                 candidate = (-candidate[0], -candidate[1])
             if candidate == (-self.direction[0], -self.direction[1]):
+                metrics.DROPPED_INPUTS.inc()
                 return
             self.direction = candidate
 
-    def get_background(self):
-        theme = self.settings["3"]["value"]
-        if theme == "Default":
-            return lambda text: text  # no background color
-        elif theme == "Rainbow":
-            rainbow_colors = [
-                self.term.on_red,
-                self.term.on_yellow,
-                self.term.on_green,
-                self.term.on_cyan,
-                self.term.on_blue,
-                self.term.on_magenta,
-            ]
-            index = int(time.time() * 2) % len(rainbow_colors)
-            return rainbow_colors[index]
-        elif theme == "Dark":
-            dark_colors = [
-                self.term.on_grey15,
-                self.term.on_grey19,
-                self.term.on_grey23,
-            ]
-            index = int(time.time() * 2) % len(dark_colors)
-            return dark_colors[index]
-        else:
-            return lambda text: text
-
     def check_achievements(self):
         if (
             self.consecutive_food >= 10
@@ -139,7 +230,7 @@ class SnakeGame:
                 self.achievements_manager.add_achievement("Long Snake")
         if (
             self.mode == "survival"
-            and (time.time() - self.start_time) >= 300
+            and (self.clock() - self.start_time) >= 300
             and "Marathon" not in self.achievements_unlocked
         ):
             self.achievements_unlocked.add("Marathon")
@@ -153,10 +244,9 @@ class SnakeGame:
             self.achievements_unlocked.add("Combo Master")
             if self.achievements_manager:
                 self.achievements_manager.add_achievement("Combo Master")
-        difficulty = self.settings.get("7", {"value": "Normal"})["value"]
         if (
             self.mode == "classic"
-            and difficulty == "Hard"
+            and self.config.difficulty == "Hard"
             and self.score >= 200
             and "Speed Demon" not in self.achievements_unlocked
         ):
@@ -169,114 +259,58 @@ class SnakeGame:
             head_x, head_y = self.snake[0]
             dx, dy = self.direction
             new_head = (head_x + dx, head_y + dy)
-            if self.mode == "classic":
-                if self.settings.get("5", {"value": False})["value"]:
-                    new_head = (
-                        (new_head[0] - 1) % (self.board_width - 2) + 1,
-                        (new_head[1] - 1) % (self.board_height - 2) + 1,
-                    )
-                else:
-                    if (
-                        new_head[0] <= 0
-                        or new_head[0] >= self.board_width - 1
-                        or new_head[1] <= 0
-                        or new_head[1] >= self.board_height - 1
-                    ):
-                        self.collisions += 1
-                        if self.lives > 1:
-                            self.lives -= 1
-                            self.cumulative_score = self.score
-                            console.print(
-                                f"[yellow]Life lost! Lives remaining: {self.lives}[/yellow]"
-                            )
-                            time.sleep(1)
-                            self.reset_game()
-                            return
-                        else:
-                            self.game_over = True
-                            return
-            else:
-                if (
-                    new_head[0] <= 0
-                    or new_head[0] >= self.board_width - 1
-                    or new_head[1] <= 0
-                    or new_head[1] >= self.board_height - 1
-                ):
-                    self.game_over = True
-                    return
-
-            if new_head in self.snake:
-                if self.mode == "classic":
-                    self.collisions += 1
-                    if self.lives > 1:
-                        self.lives -= 1
-                        self.cumulative_score = self.score
-                        console.print(
-                            f"[yellow]Life lost! Lives remaining: {self.lives}[/yellow]"
-                        )
-                        time.sleep(1)
-                        self.reset_game()
-                        return
-                    else:
-                        self.game_over = True
-                        return
-                else:
-                    self.game_over = True
-                    return
+            if self.config.wrap:
+                new_head = (
+                    (new_head[0] - 1) % (self.board_width - 2) + 1,
+                    (new_head[1] - 1) % (self.board_height - 2) + 1,
+                )
+            idx = new_head[1] * self.board_width + new_head[0]
+            cell = self.grid[idx]
+            if cell == levels.PORTAL:
+                idx = self.level.portals[idx]
+                new_head = self.level.position(idx)
+                cell = self.grid[idx]
+            if cell != levels.FREE and cell != levels.PORTAL:
+                self.handle_collision()
+                return
 
             self.snake.insert(0, new_head)
+            self.grid[idx] = levels.SNAKE
             if new_head == self.food:
-                food_points = (
-                    10
-                    if self.mode == "classic"
-                    else (15 if self.mode == "time_attack" else 20)
-                )
-                self.score += food_points
+                self.score += self.config.food_points
                 if self.mode == "classic":
                     self.cumulative_score = self.score
-                self.food_eaten += 1
+                self.stats.food_eaten += 1
                 self.consecutive_food += 1
-                audio.play_sound("assets/eat.wav")
-                self.food = self.spawn_item(exclude=self.snake)
-                if self.settings["1"]["value"]:
-                    factor = 0.97 if self.mode == "survival" else 0.98
-                    self.delay = max(0.02, self.delay * factor)
+                self.play_sound("assets/eat.wav")
+                self.food = self.spawn_item()
+                if self.config.speed_up:
+                    self.delay = max(0.02, self.delay * self.config.speed_up)
             else:
                 self.consecutive_food = 0
-                self.snake.pop()
-
-            for item in self.power_items:
-                if new_head == item["pos"]:
-                    if item["type"] == "powerup":
-                        pu_points = (
-                            20
-                            if self.mode == "classic"
-                            else (25 if self.mode == "time_attack" else 30)
-                        )
-                        self.score += pu_points
-                        if self.mode == "classic":
-                            self.cumulative_score = self.score
-                        self.powerups_collected += 1
-                        audio.play_sound("assets/power-up.wav")
-                    elif item["type"] == "powerdown":
-                        pd_points = (
-                            5
-                            if self.mode == "classic"
-                            else (7 if self.mode == "time_attack" else 10)
-                        )
-                        self.score = max(0, self.score - pd_points)
-                        self.powerdowns_collected += 1
-                        audio.play_sound("assets/power-down.wav")
-                        if len(self.snake) > 3:
-                            self.snake.pop()
-                    self.power_items.remove(item)
-                    break
+                self.remove_tail()
+
+            item = self.power_items.pop(new_head, None)
+            if item is not None:
+                if item.type is ItemType.POWERUP:
+                    self.score += self.config.powerup_points
+                    if self.mode == "classic":
+                        self.cumulative_score = self.score
+                    self.stats.powerups += 1
+                    self.play_sound("assets/power-up.wav")
+                else:
+                    self.score = max(0, self.score - self.config.powerdown_points)
+                    self.stats.powerdowns += 1
+                    self.play_sound("assets/power-down.wav")
+                    if len(self.snake) > 3:
+                        self.remove_tail()
 
             self.maybe_spawn_power_item()
             self.check_achievements()
-            self.max_length = max(self.max_length, len(self.snake))
+            if len(self.snake) > self.stats.max_length:
+                self.stats.max_length = len(self.snake)
             if self.mode == "time_attack" and (
-                time.time() - self.start_time >= self.time_limit
+                self.clock() - self.start_time >= self.time_limit
             ):
                 self.time_up = True
                 self.game_over = True
@@ -284,87 +318,219 @@ class SnakeGame:
             console.print(f"[red]Error during game update: {e}[/red]")
             self.game_over = True
 
+    def status_line(self):
+        elapsed = self.clock() - self.start_time
+        if self.mode == "classic":
+            return f"Score: {self.score} | Lives: {self.lives} | Time: {elapsed:.1f}s"
+        elif self.mode == "time_attack":
+            remaining = max(0, int(self.time_limit - elapsed))
+            return f"Score: {self.score} | Time Left: {remaining}s"
+        elif self.mode == "daily":
+            return (
+                f"Daily {self.config.day} | Score: {self.score} | Time: {elapsed:.1f}s"
+            )
+        return f"Score: {self.score} | Time: {elapsed:.1f}s"
+
+    def occupied_cells(self):
+        """Map cell index to styled text for everything drawn on open cells."""
+        level = self.level
+        styles = self.styles
+        occupied = {level.index(pos): styles.body for pos in self.snake}
+        occupied[level.index(self.snake[0])] = styles.head
+        occupied[level.index(self.food)] = styles.food
+        for pos, item in self.power_items.items():
+            occupied[level.index(pos)] = self.item_cells[item.type]
+        if self.hint is not None:
+            head_x, head_y = self.snake[0]
+            x = (head_x + self.hint[0]) % self.board_width
+            y = (head_y + self.hint[1]) % self.board_height
+            occupied.setdefault(level.index((x, y)), styles.hints[self.hint])
+        return occupied
+
+    def render_frame(self):
+        """Return the output needed to bring the screen up to date.
+
+        Walls are only emitted on a full redraw; after that, only open cells
+        whose content changed since the previous frame are written. When the
+        theme's animation moves to a new frame, the background is repainted
+        run by run from the theme's precomputed clears.
+        """
+        term = self.term
+        level = self.level
+        width = self.board_width
+        parts = []
+        if self.screen is None:
+            parts.append(term.home + term.clear)
+            self.screen = [None] * len(level.grid)
+            self.theme_frame = None
+            for idx, cell in enumerate(level.grid):
+                if cell == levels.WALL:
+                    x, y = level.position(idx)
+                    parts.append(
+                        term.move_xy(x, y) + level.wall_glyph(idx, self.styles.wall)
+                    )
+        theme = self.theme
+        frame = theme.frame_at(time.time())
+        if frame != self.theme_frame:
+            clear = theme.change(self.theme_frame, frame)
+            if clear is not None:
+                parts.append(clear)
+                self.screen[:] = theme.frames[frame]
+            self.theme_frame = frame
+        empty = theme.frames[frame]
+        occupied = self.occupied_cells()
+        screen = self.screen
+        for idx in level.open_cells:
+            text = occupied.get(idx)
+            if text is None:
+                text = empty[idx]
+            if screen[idx] != text:
+                screen[idx] = text
+                parts.append(term.move_xy(idx % width, idx // width) + text)
+        parts.append(
+            term.move_xy(0, self.board_height) + self.status_line() + term.clear_eol
+        )
+        return "".join(parts)
+
+    def full_frame(self):
+        """Render the whole screen without disturbing the diff state."""
+        screen = self.screen
+        theme_frame = self.theme_frame
+        self.screen = None
+        try:
+            return self.render_frame()
+        finally:
+            self.screen = screen
+            self.theme_frame = theme_frame
+
     def draw(self):
         try:
-            bg_color = self.get_background()
-            elapsed = time.time() - self.start_time
+            frame = self.render_frame()
             with self.term.location():
-                print(self.term.home + self.term.clear, end="")
-                print("+" + "-" * (self.board_width - 2) + "+")
-                for y in range(1, self.board_height - 1):
-                    line = "|"
-                    for x in range(1, self.board_width - 1):
-                        pos = (x, y)
-                        if pos == self.snake[0]:
-                            line += self.term.green(self.snake_head_char)
-                        elif pos in self.snake:
-                            line += self.term.green(self.snake_char)
-                        elif pos == self.food:
-                            line += self.term.red(self.food_char)
-                        elif any(item["pos"] == pos for item in self.power_items):
-                            item = next(
-                                item for item in self.power_items if item["pos"] == pos
-                            )
-                            line += (
-                                self.term.bright_yellow(self.powerup_char)
-                                if item["type"] == "powerup"
-                                else self.term.bright_red(self.powerdown_char)
-                            )
-                        else:
-                            line += bg_color(" ")
-                    line += "|"
-                    print(line)
-                print("+" + "-" * (self.board_width - 2) + "+")
-                if self.mode == "classic":
-                    print(
-                        f"Score: {self.score} | Lives: {self.lives} | Time: {elapsed:.1f}s"
-                    )
-                elif self.mode == "time_attack":
-                    remaining = max(0, int(self.time_limit - elapsed))
-                    print(f"Score: {self.score} | Time Left: {remaining}s")
-                else:
-                    print(f"Score: {self.score} | Time: {elapsed:.1f}s")
+                print(frame, end="", flush=True)
+            metrics.FRAMES.inc()
+            metrics.FRAME_BYTES.inc(len(frame.encode("utf-8")))
+            if self.recorder is not None:
+                self.recorder.write(frame)
+            if self.broadcaster is not None:
+                self.broadcaster.publish(frame, self.full_frame)
         except Exception as e:
             console.print(f"[red]Error during drawing: {e}[/red]")
 
-    async def run(self):
-        self.reset_game(initial=True)
+    def think(self):
+        """Let the search bot pick a move within its share of the tick."""
+        move = self.bot.choose(self, min(self.bot.budget, self.delay / 2))
+        if self.autopilot:
+            self.direction = move
+        else:
+            self.hint = move
+
+    def snapshot(self):
+        return snapshot.snapshot(self)
+
+    def restore(self, data):
+        snapshot.restore(self, data)
+
+    def enable_turbo(self, render_every=0, inputs=None):
+        """Run as fast as possible on a simulated clock, for soak tests.
+
+        Each tick advances game time by the current delay instead of
+        sleeping. Only every render_every-th frame is drawn (0 draws none).
+        inputs, if given, is called with the game once per tick and returns
+        the keys pressed during that tick.
+        """
+        elapsed = self.clock() - self.start_time
+        self.turbo = True
+        self.render_every = render_every
+        self.inputs = inputs
+        self.game_time = 0.0
+        self.clock = self.simulated_clock
+        self.start_time = -elapsed
+
+    def simulated_clock(self):
+        return self.game_time
+
+    def suspend(self):
+        """Stop the game so it can be saved and resumed later.
+
+        A daily challenge cannot be saved, so quitting one ends it.
+        """
+        self.suspended = self.mode != "daily"
+        self.game_over = True
+
+    async def read_keys(self, loop):
+        if self.inputs is not None:
+            return self.inputs(self)
+        inp = await loop.run_in_executor(None, self.term.inkey, self.delay)
+        return [inp.name if inp.is_sequence else inp] if inp else []
+
+    async def run(self, reset=True):
+        """Play until the game ends; returns None if it was saved instead."""
+        if reset:
+            self.reset_game(initial=True)
+            self.frame = 0
         loop = asyncio.get_event_loop()
+        if self.config.record:
+            self.recorder = recorder.Recorder(
+                self.term.width, self.term.height, f"Snake Game: {self.mode}"
+            )
+            self.screen = None  # Start the recording with a full frame.
         try:
             with self.term.cbreak(), self.term.hidden_cursor():
                 while not self.game_over:
                     start_loop = loop.time()
-                    inp = await loop.run_in_executor(None, self.term.inkey, self.delay)
-                    if inp:
-                        self.process_input(inp.name if inp.is_sequence else inp)
+                    for key in await self.read_keys(loop):
+                        if key in ("q", "Q"):
+                            self.suspend()
+                        else:
+                            self.process_input(key)
+                    if self.game_over:
+                        break
+                    tick_start = time.perf_counter()
                     self.update()
-                    self.draw()
-                    elapsed_loop = loop.time() - start_loop
-                    await asyncio.sleep(max(0, self.delay - elapsed_loop))
+                    if self.bot is not None and not self.game_over:
+                        self.think()
+                    self.frame += 1
+                    if not self.turbo:
+                        self.draw()
+                        metrics.TICK_SECONDS.observe(time.perf_counter() - tick_start)
+                        elapsed_loop = loop.time() - start_loop
+                        await asyncio.sleep(max(0, self.delay - elapsed_loop))
+                        continue
+                    if self.render_every and self.frame % self.render_every == 0:
+                        self.draw()
+                    metrics.TICK_SECONDS.observe(time.perf_counter() - tick_start)
+                    self.game_time += self.delay
+                    await asyncio.sleep(0)  # Let background tasks keep up.
         except Exception as e:
             console.print(f"[red]Error during game run: {e}[/red]")
-        if self.mode == "time_attack" and self.time_up:
-            print("Time's up!")
-            win_flag = True
-        elif self.mode == "time_attack":
-            win_flag = False
+        finally:
+            if self.recorder is not None:
+                self.recorder.close()
+                self.recorder = None
+        if self.suspended and snapshot.save_game(self):
+            print(
+                "Game saved. Choose Resume Saved Game from the main menu to continue."
+            )
+            return None
+        if not self.turbo or self.render_every:
+            if self.mode == "time_attack" and self.time_up:
+                print("Time's up!")
+            print("Game Over!")
+        self.play_sound("assets/game-over.wav")
+        return self.collect_stats()
+
+    def collect_stats(self):
+        """Fill in the end-of-game fields and return the stats record."""
+        stats = self.stats
+        if self.mode == "time_attack":
+            stats.won = self.time_up
         elif self.mode == "classic":
-            win_flag = self.lives > 0
+            stats.won = self.lives > 0
         else:
-            win_flag = False
-        print("Game Over!")
-        audio.play_sound("assets/game-over.wav")
-        # Return a dictionary of game stats.
-        game_duration = time.time() - self.start_time
-        stats = {
-            "score": self.score,
-            "duration": game_duration,
-            "max_length": self.max_length,
-            "collisions": self.collisions,
-            "food_eaten": self.food_eaten,
-            "powerups": self.powerups_collected,
-            "powerdowns": self.powerdowns_collected,
-            "lives_remaining": self.lives if self.mode == "classic" else None,
-            "won": win_flag,
-        }
+            stats.won = False
+        stats.score = self.score
+        stats.duration = self.clock() - self.start_time
+        stats.lives_remaining = self.lives if self.mode == "classic" else None
+        stats.day = self.config.day
         return stats
@@ -0,0 +1,124 @@
+# levels.py
+import os
+from rich.console import Console
+from audio import resource_path
+
+console = Console()
+
+LEVELS_DIR = "levels"
+DEFAULT_LEVEL = "Open"
+BOARD_WIDTH = 40
+BOARD_HEIGHT = 20
+
+# Cell codes stored in the collision map. Snake segments are stored as
+# SNAKE + snake id so several snakes can share one grid.
+FREE = 0
+WALL = 1
+PORTAL = 2
+SNAKE = 3
+
+WALL_CHAR = "#"
+FREE_CHARS = ". "
+
+
+def available_levels():
+    """Return the built-in level followed by every level file found on disk."""
+    names = [DEFAULT_LEVEL]
+    levels_path = resource_path(LEVELS_DIR)
+    if os.path.isdir(levels_path):
+        for filename in sorted(os.listdir(levels_path)):
+            base, ext = os.path.splitext(filename)
+            if ext == ".txt" and base.title() not in names:
+                names.append(base.title())
+    return names
+
+
+def open_level_rows(width=BOARD_WIDTH, height=BOARD_HEIGHT):
+    """Rows for the built-in level: an empty board surrounded by walls."""
+    rows = [WALL_CHAR * width]
+    rows += [WALL_CHAR + "." * (width - 2) + WALL_CHAR for _ in range(height - 2)]
+    rows.append(WALL_CHAR * width)
+    return rows
+
+
+def load_level(name=DEFAULT_LEVEL):
+    """Load a level by name, falling back to the built-in level on error."""
+    if name != DEFAULT_LEVEL:
+        file_path = resource_path(os.path.join(LEVELS_DIR, name.lower() + ".txt"))
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                rows = [
+                    line.rstrip("\n")
+                    for line in f
+                    if line.strip() and not line.startswith(";")
+                ]
+            return Level(name, rows)
+        except Exception as e:
+            console.print(f"[red]Error loading level {name}: {e}[/red]")
+    return Level(DEFAULT_LEVEL, open_level_rows())
+
+
+class Level:
+    """Static level geometry parsed once into a flat collision map.
+
+    Rows use '#' for walls, '.' or ' ' for free cells and a letter for each
+    end of a portal pair. Cells are addressed by index y * width + x.
+    """
+
+    def __init__(self, name, rows):
+        self.name = name
+        self.rows = rows
+        self.height = len(rows)
+        self.width = len(rows[0]) if rows else 0
+        if self.width < 8 or self.height < 5:
+            raise ValueError("level is too small")
+        if any(len(row) != self.width for row in rows):
+            raise ValueError("all level rows must have the same length")
+        self.grid = bytearray(self.width * self.height)
+        ends = {}
+        for y, row in enumerate(rows):
+            for x, char in enumerate(row):
+                idx = y * self.width + x
+                if char == WALL_CHAR:
+                    self.grid[idx] = WALL
+                elif char.isalpha():
+                    self.grid[idx] = PORTAL
+                    ends.setdefault(char, []).append(idx)
+                elif char not in FREE_CHARS:
+                    raise ValueError(f"unknown level character {char!r}")
+                on_edge = x in (0, self.width - 1) or y in (0, self.height - 1)
+                if on_edge and self.grid[idx] != WALL:
+                    raise ValueError("the level must be enclosed by walls")
+        self.portals = {}
+        for char, cells in ends.items():
+            if len(cells) != 2:
+                raise ValueError(f"portal {char!r} must appear exactly twice")
+            self.portals[cells[0]] = cells[1]
+            self.portals[cells[1]] = cells[0]
+        # Spawnable cells never change during a game, so collect them once.
+        self.free_cells = [i for i, cell in enumerate(self.grid) if cell == FREE]
+        self.open_cells = [i for i, cell in enumerate(self.grid) if cell != WALL]
+        start_x = self.width // 2
+        start_y = self.height // 2
+        for x in range(start_x - 2, start_x + 2):
+            if self.grid[start_y * self.width + x] != FREE:
+                raise ValueError("the snake start position must be free")
+
+    def index(self, pos):
+        return pos[1] * self.width + pos[0]
+
+    def position(self, idx):
+        return (idx % self.width, idx // self.width)
+
+    def wall_glyph(self, idx, inner="█"):
+        """Glyph for a wall cell; the outer ring keeps the classic border look."""
+        x, y = self.position(idx)
+        on_edge_x = x in (0, self.width - 1)
+        on_edge_y = y in (0, self.height - 1)
+        if on_edge_x and on_edge_y:
+            return "+"
+        if on_edge_y:
+            return "-"
+        if on_edge_x:
+            return "|"
+        return inner
@@ -7,51 +7,146 @@ from achievements import AchievementsManager
 from ui import (
     entrance_menu,
     start_game_menu,
+    multiplayer_menu,
+    multiplayer_results_menu,
+    daily_results_menu,
     instructions_menu,
     about_menu,
     settings_menu,
     achievements_stats_menu,
-    safe_input,
 )
-from game import SnakeGame
+from game import shared_terminal
+from menu import pause
+from memwatch import MemoryTracker
+from metrics import MetricsExporter
+from pool import EnginePool
+from spectate import Broadcaster
+import snapshot
 import audio
 
 
+async def finish_game(mode, game_stats, score_manager, achievements_manager):
+    # A game saved with Q returns None and is recorded only once finished.
+    if game_stats is not None:
+        if mode == "multiplayer":
+            multiplayer_results_menu(game_stats.standings)
+        score_manager.update_score(mode, game_stats)
+        if mode == "daily":
+            daily_results_menu(score_manager, game_stats)
+        achievements_manager.update_stats(game_stats.score)
+    await pause("Press ENTER to return to the main menu...")
+
+
 async def main():
     settings_manager = SettingsManager()
-    # Initialize music only if enabled.
+    # Initialize music only if enabled. Either way pygame loads in the
+    # background, so the first menu shows straight away.
+    audio.set_low_latency(settings_manager.options["16"]["value"])
+    preload = audio.preload
     if settings_manager.options["6"]["value"]:
-        audio.init_audio()
+        preload = audio.init_audio
+    audio_ready = asyncio.get_running_loop().run_in_executor(None, preload)
     score_manager = ScoreManager()
     achievements_manager = AchievementsManager()
+    broadcaster = None
+    # Engines, the terminal and sounds are reused so long sessions stay flat.
+    engines = EnginePool()
+    memory_tracker = MemoryTracker()
+    if settings_manager.options["13"]["value"]:
+        memory_tracker.start()
+    exporter = None
+    if settings_manager.options["14"]["value"]:
+        exporter = MetricsExporter()
+        await exporter.start()
 
-    while True:
-        choice = entrance_menu(settings_manager)
-        if choice == "1":
-            mode = start_game_menu()
-            if mode is None:
-                continue
-            game = SnakeGame(
-                settings_manager.options,
-                mode=mode,
-                achievements_manager=achievements_manager,
-            )
-            game_stats = await game.run()
-            score_manager.update_score(mode, game_stats)
-            achievements_manager.update_stats(game_stats["score"])
-            safe_input("Press ENTER to return to the main menu...")
-        elif choice == "2":
-            instructions_menu()
-        elif choice == "3":
-            about_menu()
-        elif choice == "4":
-            settings_menu(settings_manager)
-        elif choice == "5":
-            achievements_stats_menu(score_manager, achievements_manager)
-        elif choice in ["6", "q", "Q"]:
-            print("Goodbye and thanks for playing!")
-            time.sleep(2)
-            sys.exit(0)
+    # Menus read single keys, so the terminal stays in cbreak mode between
+    # games as well.
+    with shared_terminal().cbreak():
+        while True:
+            choice = await entrance_menu(settings_manager)
+            if choice == "1":
+                mode = await start_game_menu()
+                if mode is None:
+                    continue
+                if settings_manager.options["10"]["value"] and broadcaster is None:
+                    broadcaster = Broadcaster()
+                    await broadcaster.start()
+                elif not settings_manager.options["10"]["value"] and broadcaster:
+                    broadcaster.close()
+                    broadcaster = None
+                if mode == "multiplayer":
+                    players = await multiplayer_menu()
+                    if players is None:
+                        continue
+                    humans, bots = players
+                    game = engines.acquire(
+                        settings_manager.options,
+                        mode,
+                        humans,
+                        bots,
+                        broadcaster=broadcaster,
+                    )
+                else:
+                    game = engines.acquire(
+                        settings_manager.options,
+                        mode,
+                        achievements_manager=achievements_manager,
+                        broadcaster=broadcaster,
+                    )
+                await audio_ready
+                game_stats = await game.run()
+                memory_tracker.sample()
+                await finish_game(mode, game_stats, score_manager, achievements_manager)
+            elif choice in ["r", "R"]:
+                data = snapshot.load_game()
+                if data is None:
+                    continue
+                mode = snapshot.peek_mode(data)
+                game = engines.acquire(
+                    settings_manager.options,
+                    mode,
+                    achievements_manager=achievements_manager,
+                    broadcaster=broadcaster,
+                )
+                game.restore(data)
+                await audio_ready
+                game_stats = await game.run(reset=False)
+                if game_stats is not None:
+                    snapshot.discard_game()  # Finished, not saved again.
+                memory_tracker.sample()
+                await finish_game(mode, game_stats, score_manager, achievements_manager)
+            elif choice == "2":
+                await instructions_menu()
+            elif choice == "3":
+                await about_menu()
+            elif choice == "4":
+                await audio_ready
+                await settings_menu(settings_manager)
+                if audio.set_low_latency(settings_manager.options["16"]["value"]):
+                    if settings_manager.options["6"]["value"]:
+                        audio.init_audio()
+                if settings_manager.options["13"]["value"]:
+                    memory_tracker.start()
+                else:
+                    memory_tracker.stop()
+                if settings_manager.options["14"]["value"] and exporter is None:
+                    exporter = MetricsExporter()
+                    await exporter.start()
+                elif not settings_manager.options["14"]["value"] and exporter:
+                    exporter.close()
+                    exporter = None
+            elif choice == "5":
+                await achievements_stats_menu(
+                    score_manager, achievements_manager, memory_tracker
+                )
+            elif choice == "6":
+                if broadcaster is not None:
+                    broadcaster.close()
+                if exporter is not None:
+                    exporter.close()
+                print("Goodbye and thanks for playing!")
+                time.sleep(2)
+                sys.exit(0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,73 @@
+# memwatch.py
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None
+
+MAX_SAMPLES = 100
+TOP_SITES = 10
+
+
+def rss_kb():
+    """Resident set size in KB; the peak where the current size is unknown."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class MemoryTracker:
+    """Sample memory use after every game for the memory report.
+
+    RSS is always sampled. tracemalloc slows every allocation down, so it
+    only runs while tracking is switched on in Settings. Samples go into a
+    bounded deque so the tracker itself does not grow.
+    """
+
+    def __init__(self, max_samples=MAX_SAMPLES):
+        self.samples = deque(maxlen=max_samples)
+        self.games = 0
+        self.baseline = None
+
+    @property
+    def tracing(self):
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        if not self.tracing:
+            tracemalloc.start()
+            self.baseline = tracemalloc.take_snapshot()
+
+    def stop(self):
+        if self.tracing:
+            tracemalloc.stop()
+        self.baseline = None
+
+    def sample(self):
+        """Record (games, time, RSS KB, traced KB) after a game."""
+        self.games += 1
+        traced = None
+        if self.tracing:
+            traced = tracemalloc.get_traced_memory()[0] // 1024
+        self.samples.append((self.games, time.time(), rss_kb(), traced))
+
+    def top_sites(self, limit=TOP_SITES):
+        """The allocation sites that grew most since tracking started."""
+        if self.baseline is None or not self.tracing:
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        return snapshot.compare_to(self.baseline, "lineno")[:limit]
@@ -0,0 +1,209 @@
+# menu.py
+import asyncio
+from rich.console import Console
+from game import shared_terminal
+
+console = Console()
+
+KEY_TIMEOUT = 0.1  # Seconds a key read waits before checking for a resize.
+BACK_KEYS = ("KEY_ESCAPE", "b", "B")
+MAX_SCREENS = 16
+
+screens = {}  # (build, args, width, colors) -> text, least recently used first.
+
+
+def render(*renderables):
+    """rich renderables as the text console.print would write."""
+    with console.capture() as capture:
+        for renderable in renderables:
+            console.print(renderable)
+    return capture.get()
+
+
+def cached_render(build, *args):
+    """render(*build(*args)), laid out once per terminal width and colors.
+
+    args carry the settings a screen shows, such as the start screen art,
+    so resizing the terminal or changing one of those settings lays the
+    screen out afresh while every other visit reuses the text.
+    """
+    key = (build, args, console.width, shared_terminal().number_of_colors)
+    text = screens.pop(key, None)
+    if text is None:
+        text = render(*build(*args))
+        while len(screens) >= MAX_SCREENS:
+            del screens[next(iter(screens))]
+    screens[key] = text
+    return text
+
+
+async def read_key(term, timeout=KEY_TIMEOUT):
+    """The next key's name or character, or None if none came in time.
+
+    The read happens in a worker thread, so other tasks on the event loop
+    keep running while a menu waits.
+    """
+    loop = asyncio.get_running_loop()
+    key = await loop.run_in_executor(None, term.inkey, timeout)
+    if not key:
+        return None
+    return key.name if key.is_sequence else str(key)
+
+
+def drain_keys(term):
+    """Drop keys typed before a menu was shown, such as a game's last moves."""
+    while term.inkey(timeout=0):
+        pass
+
+
+def write(text):
+    print(text, end="", flush=True)
+
+
+async def wait_for_enter(term):
+    drain_keys(term)
+    while await read_key(term) not in ("KEY_ENTER", "\n", "\r"):
+        pass
+
+
+async def pause(prompt="Press ENTER to continue..."):
+    """Show prompt under whatever is on screen and wait for ENTER."""
+    write("\n" + prompt)
+    await wait_for_enter(shared_terminal())
+    write("\n")
+
+
+async def show_screen(text, prompt="Press ENTER to return..."):
+    """Replace the screen with rendered text in one write and wait for ENTER."""
+    term = shared_terminal()
+    write(term.home + term.clear + text + "\n" + prompt)
+    await wait_for_enter(term)
+    write("\n")
+
+
+async def show_page(*renderables, prompt="Press ENTER to return..."):
+    """Clear the screen, print renderables and wait for ENTER."""
+    await show_screen(render(*renderables), prompt)
+
+
+class Menu:
+    """A keypress-driven menu drawn below a header.
+
+    items are [key, label] pairs, or [key, label, shortcuts] where
+    shortcuts is a string of the characters that pick the item, the first
+    shown as its tag. Arrow keys move the highlight and ENTER picks it, or
+    an item's shortcut (by default its key) picks it straight away. Each
+    draw compares the rows with the last ones written and rewrites only
+    those that changed, so moving the highlight or updating a value costs
+    two short writes. The whole menu is drawn again when the terminal is resized,
+    asking header() for text laid out for the new width.
+    """
+
+    def __init__(self, header, items, default=None, back=None, arrows=False):
+        self.term = shared_terminal()
+        self.header = header
+        self.header_rows = 0
+        self.items = items
+        self.selected = 0
+        self.back = back
+        # With arrows, LEFT and RIGHT pick the highlighted item too and
+        # step says which way, for settings that cycle through choices.
+        self.arrows = arrows
+        self.step = 1
+        self.status = ""
+        self.lines = None
+        self.size = None
+        if default is not None:
+            self.select(default)
+
+    def select(self, key):
+        for idx, item in enumerate(self.items):
+            if item[0].lower() == key.lower():
+                self.selected = idx
+                return True
+        return False
+
+    def shortcuts(self, idx):
+        """The keys that pick item idx, the one shown as its tag first."""
+        item = self.items[idx]
+        return list(item[2]) if len(item) > 2 else [item[0]]
+
+    def select_shortcut(self, key):
+        """Highlight the item key is a shortcut for; False if there is none."""
+        for idx in range(len(self.items)):
+            if key.lower() in (shortcut.lower() for shortcut in self.shortcuts(idx)):
+                self.selected = idx
+                return True
+        return False
+
+    def row(self, idx):
+        term = self.term
+        label = self.items[idx][1]
+        width = max(len(self.shortcuts(i)[0]) for i in range(len(self.items))) + 1
+        tag = f"{self.shortcuts(idx)[0]}.".ljust(width)
+        if idx == self.selected:
+            return term.reverse(f"{tag} {label}")
+        return f"{term.bold_yellow(tag)} {label}"
+
+    def rows(self):
+        return [self.row(idx) for idx in range(len(self.items))] + ["", self.status]
+
+    def draw(self):
+        term = self.term
+        rows = self.rows()
+        size = (term.width, term.height)
+        if self.lines is None or size != self.size:
+            self.size = size
+            header = self.header()
+            self.header_rows = header.count("\n")
+            out = [term.home, term.clear, header]
+            out.extend(row + "\n" for row in rows)
+        else:
+            out = []
+            for y, (old, new) in enumerate(zip(self.lines, rows)):
+                if old != new:
+                    out.append(
+                        term.move_xy(0, self.header_rows + y) + new + term.clear_eol
+                    )
+        self.lines = rows
+        if out:
+            write("".join(out))
+
+    def redraw(self):
+        self.lines = None
+
+    async def choose(self):
+        """Wait for an item to be picked and return its key, or back."""
+        term = self.term
+        drain_keys(term)
+        while True:
+            self.draw()
+            key = await read_key(term)
+            if key is None:
+                continue
+            if key == "KEY_UP":
+                self.selected = (self.selected - 1) % len(self.items)
+            elif key == "KEY_DOWN":
+                self.selected = (self.selected + 1) % len(self.items)
+            elif key in ("KEY_ENTER", "\n", "\r"):
+                self.step = 1
+                return self.items[self.selected][0]
+            elif self.arrows and key in ("KEY_LEFT", "KEY_RIGHT"):
+                self.step = -1 if key == "KEY_LEFT" else 1
+                return self.items[self.selected][0]
+            elif self.select_shortcut(key):
+                self.step = 1
+                return self.items[self.selected][0]
+            elif self.back is not None and key in BACK_KEYS:
+                return self.back
+
+    async def confirm(self, question):
+        """Ask a yes/no question on the status line."""
+        self.status = f"{question} (y/n)"
+        self.draw()
+        while True:
+            key = await read_key(self.term)
+            if key in ("y", "Y", "n", "N", "KEY_ESCAPE"):
+                break
+        self.status = ""
+        return key in ("y", "Y")
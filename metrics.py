@@ -0,0 +1,227 @@
+# metrics.py
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from bisect import bisect_left
+from rich.console import Console
+
+console = Console()
+
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9464
+METRICS_SOCKET = os.path.join(tempfile.gettempdir(), "snake-game-metrics.sock")
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry = []  # Every metric, in the order they are exported.
+
+
+def format_value(value):
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def series_name(name, label, value, extra=""):
+    labels = []
+    if label is not None:
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        labels.append(f'{label}="{escaped}"')
+    if extra:
+        labels.append(extra)
+    return f"{name}{{{','.join(labels)}}}" if labels else name
+
+
+class Counter:
+    """A count that only goes up, optionally split by one label.
+
+    inc is a dict update and an add with no lock: metrics are only updated
+    from the event loop thread, and a scrape runs on that thread too.
+    """
+
+    def __init__(self, name, description, label=None):
+        self.name = name
+        self.description = description
+        self.label = label
+        self.values = {}  # Label value (None without a label) -> count.
+        if label is None:
+            self.values[None] = 0  # Exported as 0 before the first inc.
+        registry.append(self)
+
+    def inc(self, amount=1, value=None):
+        self.values[value] = self.values.get(value, 0) + amount
+
+    def lines(self):
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} counter"
+        for value, count in self.values.items():
+            yield f"{series_name(self.name, self.label, value)} {format_value(count)}"
+
+
+class Histogram:
+    """Observations counted into fixed buckets, optionally split by one label.
+
+    Each series keeps a count per bucket, made cumulative only when
+    scraped, so observe is a bisect and two adds.
+    """
+
+    def __init__(self, name, description, buckets, label=None):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets)
+        self.label = label
+        self.series = {}  # Label value -> [bucket counts, sum].
+
+        if label is None:
+            self.add_series(None)
+        registry.append(self)
+
+    def add_series(self, value):
+        series = self.series[value] = [[0] * (len(self.buckets) + 1), 0.0]
+        return series
+
+    def observe(self, amount, value=None):
+        series = self.series.get(value) or self.add_series(value)
+        series[0][bisect_left(self.buckets, amount)] += 1
+        series[1] += amount
+
+    def lines(self):
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} histogram"
+        for value, (counts, total) in self.series.items():
+            seen = 0
+            bounds = [format_value(b) for b in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, counts):
+                seen += count
+                name = series_name(
+                    self.name + "_bucket", self.label, value, f'le="{bound}"'
+                )
+                yield f"{name} {seen}"
+            total_name = series_name(self.name + "_sum", self.label, value)
+            yield f"{total_name} {format_value(total)}"
+            yield f"{series_name(self.name + '_count', self.label, value)} {seen}"
+
+
+TICK_SECONDS = Histogram(
+    "snake_tick_seconds",
+    "Time spent updating and drawing a game tick, excluding the wait.",
+    (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25),
+)
+FRAMES = Counter("snake_frames_total", "Frames written to the terminal.")
+FRAME_BYTES = Counter("snake_frame_bytes_total", "Bytes of frames written.")
+DROPPED_INPUTS = Counter(
+    "snake_dropped_inputs_total", "Turns ignored because they reversed the snake."
+)
+GAMES = Counter("snake_games_total", "Finished games.", "mode")
+ACHIEVEMENTS = Counter(
+    "snake_achievements_unlocked_total", "Achievements unlocked.", "achievement"
+)
+WRITE_SECONDS = Histogram(
+    "snake_write_seconds",
+    "Persistence write latency by file.",
+    (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5),
+    "file",
+)
+
+
+def render():
+    """Every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in registry:
+        lines.extend(metric.lines())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """Serve render() to Prometheus over HTTP on localhost or a Unix socket.
+
+    Metrics are rendered on the event loop only when scraped, so a game
+    with nobody scraping pays for the counter updates alone.
+    """
+
+    def __init__(self, host=METRICS_HOST, port=METRICS_PORT, path=METRICS_SOCKET):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.servers = []
+
+    async def start(self):
+        try:
+            self.servers.append(
+                await asyncio.start_server(self.serve, self.host, self.port)
+            )
+            if self.path and hasattr(asyncio, "start_unix_server"):
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                self.servers.append(
+                    await asyncio.start_unix_server(self.serve, self.path)
+                )
+        except OSError as e:
+            console.print(f"[red]Error starting metrics exporter: {e}[/red]")
+
+    def close(self):
+        for server in self.servers:
+            server.close()
+        self.servers = []
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    async def serve(self, reader, writer):
+        try:
+            request = (await reader.readline()).split()
+            # Skip the headers; nothing in them changes the answer.
+            while (await reader.readline()).strip():
+                pass
+            if len(request) >= 2 and request[1].split(b"?")[0] == b"/metrics":
+                status, body = "200 OK", render().encode("utf-8")
+            else:
+                status, body = "404 Not Found", b"Not found\n"
+            head = (
+                f"HTTP/1.0 {status}\r\nContent-Type: {CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+            )
+            writer.write(head.encode("ascii") + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def scrape(host, port, path):
+    """GET /metrics from a running exporter and return the body."""
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"GET /metrics HTTP/1.0\r\nHost: localhost\r\n\r\n")
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    if not head.startswith(b"HTTP/1.0 200"):
+        raise ConnectionError(head.split(b"\r\n")[0].decode("ascii", "replace"))
+    return body.decode("utf-8")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape a running Snake Game")
+    parser.add_argument("--host", default=METRICS_HOST)
+    parser.add_argument("--port", type=int, default=METRICS_PORT)
+    parser.add_argument(
+        "--socket",
+        nargs="?",
+        const=METRICS_SOCKET,
+        default=None,
+        help="connect through the Unix socket instead of TCP",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        sys.stdout.write(asyncio.run(scrape(args.host, args.port, args.socket)))
+    except (ConnectionError, FileNotFoundError) as e:
+        console.print(f"[red]Error scraping metrics: {e}[/red]")
+        sys.exit(1)
@@ -0,0 +1,308 @@
+# multiplayer.py
+import levels
+import metrics
+from game import SnakeGame, console
+from state import DIRECTIONS, GameStats, ItemType, SnakeState
+
+MIN_SNAKES = 2
+MAX_SNAKES = 8
+MAX_HUMANS = 4
+
+# Movement keys for each human player, in player order.
+PLAYER_KEYS = [
+    {"KEY_UP": (0, -1), "KEY_DOWN": (0, 1), "KEY_LEFT": (-1, 0), "KEY_RIGHT": (1, 0)},
+    {"w": (0, -1), "s": (0, 1), "a": (-1, 0), "d": (1, 0)},
+    {"i": (0, -1), "k": (0, 1), "j": (-1, 0), "l": (1, 0)},
+    {"t": (0, -1), "g": (0, 1), "f": (-1, 0), "h": (1, 0)},
+]
+PLAYER_KEY_NAMES = ["Arrow keys", "W/A/S/D", "I/J/K/L", "T/F/G/H"]
+# Per-tick changes recorded by the engine so they can be sent over the network.
+DELTA_HEAD = 1
+DELTA_TAIL = 2
+DELTA_FOOD = 3
+DELTA_ITEM = 4
+DELTA_ITEM_GONE = 5
+DELTA_DEAD = 6
+DELTA_SCORE = 7
+ITEM_CODES = {ItemType.POWERUP: 0, ItemType.POWERDOWN: 1}
+SNAKE_COLORS = [
+    "green",
+    "cyan",
+    "blue",
+    "white",
+    "bright_green",
+    "bright_cyan",
+    "bright_blue",
+    "bright_magenta",
+]
+
+
+class MultiSnakeGame(SnakeGame):
+    """Several human and AI snakes sharing one board and one occupancy grid."""
+
+    def __init__(
+        self,
+        settings,
+        humans=1,
+        bots=1,
+        achievements_manager=None,
+        broadcaster=None,
+        config=None,
+    ):
+        if not MIN_SNAKES <= humans + bots <= MAX_SNAKES:
+            raise ValueError(f"between {MIN_SNAKES} and {MAX_SNAKES} snakes required")
+        self.snakes = [SnakeState(i, f"P{i + 1}", True) for i in range(humans)]
+        self.snakes += [
+            SnakeState(i, f"CPU{i + 1}", False) for i in range(humans, humans + bots)
+        ]
+        super().__init__(
+            settings,
+            mode="multiplayer",
+            achievements_manager=achievements_manager,
+            broadcaster=broadcaster,
+            config=config,
+        )
+        self.bot = None  # The search bot only models a single snake.
+        self.snake_cells = [
+            self.styles.snake_cells(SNAKE_COLORS[s.sid]) for s in self.snakes
+        ]
+        # Every key resolves to its snake and direction with one dict lookup.
+        self.key_map = {}
+        for snake in self.snakes[:MAX_HUMANS]:
+            if snake.human:
+                for key, direction in PLAYER_KEYS[snake.sid].items():
+                    self.key_map[key] = (snake, direction)
+
+    def reset_game(self, initial=False):
+        self.score = 0
+        self.start_time = self.clock()
+        self.time_up = False
+        self.grid = bytearray(self.level.grid)
+        self.deltas = []
+        count = len(self.snakes)
+        for snake in self.snakes:
+            preferred_row = (snake.sid + 1) * self.board_height // (count + 1)
+            heading = (1, 0) if snake.sid % 2 == 0 else (-1, 0)
+            snake.body = self.find_start(preferred_row, heading)
+            snake.direction = snake.next_direction = heading
+            snake.alive = True
+            snake.stats = GameStats(max_length=len(snake.body))
+            for pos in snake.body:
+                self.grid[self.level.index(pos)] = levels.SNAKE + snake.sid
+        self.snake = self.snakes[0].body
+        self.food = None
+        self.power_items = {}
+        self.food = self.spawn_item()
+        self.screen = None
+        self.delay = self.initial_delay()
+        self.game_over = False
+
+    def find_start(self, preferred_row, heading):
+        """Find a free run of cells for a length-3 snake plus its first move."""
+        width = self.board_width
+        rows = sorted(
+            range(1, self.board_height - 1), key=lambda y: abs(y - preferred_row)
+        )
+        columns = sorted(range(3, width - 3), key=lambda x: abs(x - width // 2))
+        for y in rows:
+            for x in columns:
+                cells = [(x - heading[0] * i, y) for i in range(-1, 3)]
+                if all(
+                    self.grid[self.level.index(pos)] == levels.FREE for pos in cells
+                ):
+                    return cells[1:]
+        raise ValueError("no room to place every snake on this level")
+
+    def process_input(self, key):
+        target = self.key_map.get(key)
+        if target is None:
+            return
+        snake, candidate = target
+        if self.config.invert:
+            candidate = (-candidate[0], -candidate[1])
+        self.steer(snake.sid, candidate)
+
+    def suspend(self):
+        # Multiplayer games cannot be saved, so quitting simply ends the game.
+        self.game_over = True
+
+    def steer(self, sid, direction):
+        """Queue a turn for a snake, ignoring turns back into its own neck."""
+        snake = self.snakes[sid]
+        if direction == (-snake.direction[0], -snake.direction[1]):
+            metrics.DROPPED_INPUTS.inc()
+        else:
+            snake.next_direction = direction
+
+    async def read_keys(self, loop):
+        # Drain every pending key so simultaneous players never wait a tick.
+        keys = await super().read_keys(loop)
+        if self.inputs is not None:
+            return keys
+        inp = self.term.inkey(0)
+        while inp:
+            keys.append(inp.name if inp.is_sequence else inp)
+            inp = self.term.inkey(0)
+        return keys
+
+    def is_blocked(self, idx):
+        cell = self.grid[idx]
+        if cell == levels.PORTAL:
+            cell = self.grid[self.level.portals[idx]]
+        return cell != levels.FREE and cell != levels.PORTAL
+
+    def steer_bot(self, snake):
+        """Greedy AI: the unblocked move that gets closest to the food."""
+        head_x, head_y = snake.body[0]
+        food_x, food_y = self.food
+        best = None
+        for direction in DIRECTIONS:
+            if direction == (-snake.direction[0], -snake.direction[1]):
+                continue
+            x, y = head_x + direction[0], head_y + direction[1]
+            if self.is_blocked(y * self.board_width + x):
+                continue
+            distance = abs(x - food_x) + abs(y - food_y)
+            if direction == snake.direction:
+                distance -= 0.5  # Prefer going straight on ties.
+            if best is None or distance < best[0]:
+                best = (distance, direction)
+        if best is not None:
+            snake.next_direction = best[1]
+
+    def maybe_spawn_power_item(self):
+        item = super().maybe_spawn_power_item()
+        if item is not None:
+            self.deltas.append((DELTA_ITEM, ITEM_CODES[item.type]) + item.pos)
+        return item
+
+    def remove_tail(self, snake):
+        x, y = snake.body.pop()
+        idx = y * self.board_width + x
+        self.grid[idx] = self.level.grid[idx]
+        self.deltas.append((DELTA_TAIL, snake.sid, x, y))
+
+    def kill(self, snake):
+        snake.alive = False
+        snake.stats.collisions += 1
+        self.deltas.append((DELTA_DEAD, snake.sid, 0, 0))
+        for pos in snake.body:
+            idx = self.level.index(pos)
+            self.grid[idx] = self.level.grid[idx]
+
+    def update(self):
+        try:
+            width = self.board_width
+            self.deltas.clear()
+            moves = {}
+            crashed = []
+            for snake in self.snakes:
+                if not snake.alive:
+                    continue
+                if not snake.human:
+                    self.steer_bot(snake)
+                snake.direction = snake.next_direction
+                head_x, head_y = snake.body[0]
+                new_head = (head_x + snake.direction[0], head_y + snake.direction[1])
+                idx = new_head[1] * width + new_head[0]
+                cell = self.grid[idx]
+                if cell == levels.PORTAL:
+                    idx = self.level.portals[idx]
+                    new_head = self.level.position(idx)
+                    cell = self.grid[idx]
+                if cell != levels.FREE and cell != levels.PORTAL:
+                    crashed.append(snake)
+                else:
+                    moves.setdefault(idx, []).append((snake, new_head))
+            for idx, movers in list(moves.items()):
+                if len(movers) > 1:  # Head-to-head: everyone involved crashes.
+                    crashed.extend(snake for snake, _ in movers)
+                    del moves[idx]
+            for snake in crashed:
+                self.kill(snake)
+            # Place every head before eating so food never respawns under one.
+            for idx, [(snake, new_head)] in moves.items():
+                snake.body.insert(0, new_head)
+                self.grid[idx] = levels.SNAKE + snake.sid
+                self.deltas.append((DELTA_HEAD, snake.sid) + new_head)
+            for [(snake, new_head)] in moves.values():
+                self.feed_snake(snake, new_head)
+            self.snake = self.snakes[0].body
+            self.score = self.snakes[0].stats.score
+            self.maybe_spawn_power_item()
+            alive = [snake for snake in self.snakes if snake.alive]
+            humans = [snake for snake in self.snakes if snake.human]
+            if len(alive) <= 1 or (humans and not any(s.alive for s in humans)):
+                self.game_over = True
+        except Exception as e:
+            console.print(f"[red]Error during game update: {e}[/red]")
+            self.game_over = True
+
+    def feed_snake(self, snake, new_head):
+        stats = snake.stats
+        score = stats.score
+        if new_head == self.food:
+            stats.score += self.config.food_points
+            stats.food_eaten += 1
+            self.play_sound("assets/eat.wav")
+            self.food = self.spawn_item()
+            self.deltas.append((DELTA_FOOD, 0) + self.food)
+            if self.config.speed_up:
+                self.delay = max(0.02, self.delay * self.config.speed_up)
+        else:
+            self.remove_tail(snake)
+        item = self.power_items.pop(new_head, None)
+        if item is not None:
+            if item.type is ItemType.POWERUP:
+                stats.score += self.config.powerup_points
+                stats.powerups += 1
+                self.play_sound("assets/power-up.wav")
+            else:
+                stats.score = max(0, stats.score - self.config.powerdown_points)
+                stats.powerdowns += 1
+                self.play_sound("assets/power-down.wav")
+                if len(snake.body) > 3:
+                    self.remove_tail(snake)
+            self.deltas.append((DELTA_ITEM_GONE, 0) + new_head)
+        if stats.score != score:
+            self.deltas.append((DELTA_SCORE, snake.sid, stats.score))
+        if len(snake.body) > stats.max_length:
+            stats.max_length = len(snake.body)
+
+    def occupied_cells(self):
+        level = self.level
+        occupied = {}
+        for snake in self.snakes:
+            if snake.alive:
+                head_cell, body_cell = self.snake_cells[snake.sid]
+                for pos in snake.body:
+                    occupied[level.index(pos)] = body_cell
+                occupied[level.index(snake.body[0])] = head_cell
+        occupied[level.index(self.food)] = self.styles.food
+        for pos, item in self.power_items.items():
+            occupied[level.index(pos)] = self.item_cells[item.type]
+        return occupied
+
+    def status_line(self):
+        elapsed = self.clock() - self.start_time
+        scores = " | ".join(
+            f"{snake.name}: {snake.stats.score}" + ("" if snake.alive else " (out)")
+            for snake in self.snakes
+        )
+        return f"{scores} | Time: {elapsed:.1f}s"
+
+    def standings(self):
+        """Snakes ordered by survival first, then by score."""
+        return sorted(self.snakes, key=lambda s: (s.alive, s.stats.score), reverse=True)
+
+    def collect_stats(self):
+        player = self.snakes[0]
+        standings = self.standings()
+        stats = player.stats
+        stats.duration = self.clock() - self.start_time
+        stats.won = standings[0] is player
+        stats.standings = [
+            {"name": s.name, "score": s.stats.score, "alive": s.alive}
+            for s in standings
+        ]
+        return stats
@@ -0,0 +1,60 @@
+# pool.py
+from game import SnakeGame
+from multiplayer import MultiSnakeGame
+from settings import GameConfig
+
+MAX_ENGINES = 4
+
+
+class EnginePool:
+    """Reuse game engines across the games of a long session.
+
+    An engine is built around the level and assist settings, so those are
+    part of its key and changing them gets a fresh engine. Everything else
+    is read again at the start of each game. At most max_engines are kept;
+    the least recently used one is dropped first.
+    """
+
+    def __init__(self, max_engines=MAX_ENGINES):
+        self.max_engines = max_engines
+        self.engines = {}  # Key -> engine, least recently used first.
+        self.built = 0
+        self.reused = 0
+
+    def acquire(
+        self,
+        settings,
+        mode,
+        humans=1,
+        bots=1,
+        achievements_manager=None,
+        broadcaster=None,
+    ):
+        # Compiled once here and handed to the engine, which also keys the
+        # pool by it, as some modes fix the level and assist.
+        config = GameConfig(settings, mode)
+        level = config.level
+        key = (mode, humans, bots, level, config.assist, config.think_time)
+        game = self.engines.pop(key, None)
+        # A restored save may have switched the engine to its own level.
+        if game is not None and game.level.name == level:
+            game.new_game(achievements_manager, broadcaster, config)
+            self.reused += 1
+        else:
+            if mode == "multiplayer":
+                game = MultiSnakeGame(
+                    settings, humans, bots, broadcaster=broadcaster, config=config
+                )
+            else:
+                game = SnakeGame(
+                    settings,
+                    mode=mode,
+                    achievements_manager=achievements_manager,
+                    broadcaster=broadcaster,
+                    config=config,
+                )
+            self.built += 1
+            while len(self.engines) >= self.max_engines:
+                del self.engines[next(iter(self.engines))]
+        self.engines[key] = game
+        return game
@@ -0,0 +1,126 @@
+# protocol.py
+import json
+import struct
+from multiplayer import (
+    DELTA_FOOD,
+    DELTA_HEAD,
+    DELTA_ITEM,
+    DELTA_SCORE,
+    ITEM_CODES,
+)
+from state import DIRECTIONS
+
+# Every message is a 2-byte big-endian length followed by the payload. The
+# first payload byte is the message type.
+HEADER = struct.Struct("!H")
+MAX_PAYLOAD = 0xFFFF
+
+# Client to server.
+MSG_JOIN = 1
+MSG_INPUT = 2
+MSG_STATS = 3
+# Server to client.
+MSG_WELCOME = 10
+MSG_TICK = 11
+MSG_OVER = 12
+MSG_STATS_REPLY = 13
+
+NO_SNAKE = 0xFF  # Snake id sent to clients that are only watching.
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+WELCOME = struct.Struct("!BBBB")
+TICK = struct.Struct("!BI")
+# Each delta is four bytes: kind, snake id or item code, then x and y.
+# Score deltas replace x and y with a 16-bit score.
+DELTA = struct.Struct("!BBBB")
+SCORE_DELTA = struct.Struct("!BBH")
+
+
+def frame(payload):
+    return HEADER.pack(len(payload)) + payload
+
+
+async def read_message(reader):
+    """Read one payload; raises asyncio.IncompleteReadError on disconnect."""
+    (length,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return await reader.readexactly(length)
+
+
+def encode_join(room):
+    return frame(bytes([MSG_JOIN]) + room.encode("utf-8"))
+
+
+def encode_input(direction):
+    return frame(bytes([MSG_INPUT, DIRECTION_CODES[direction]]))
+
+
+def encode_stats_request():
+    return frame(bytes([MSG_STATS]))
+
+
+def encode_welcome(sid, level):
+    rows = "\n".join(level.rows).encode("utf-8")
+    return frame(WELCOME.pack(MSG_WELCOME, sid, level.width, level.height) + rows)
+
+
+def encode_deltas(deltas):
+    parts = []
+    for delta in deltas:
+        if delta[0] == DELTA_SCORE:
+            parts.append(SCORE_DELTA.pack(delta[0], delta[1], min(delta[2], 0xFFFF)))
+        else:
+            parts.append(DELTA.pack(*delta))
+    return b"".join(parts)
+
+
+def encode_tick(tick, deltas):
+    return frame(TICK.pack(MSG_TICK, tick) + encode_deltas(deltas))
+
+
+def encode_over(winner_sid):
+    return frame(bytes([MSG_OVER, winner_sid]))
+
+
+def encode_stats_reply(stats):
+    return frame(bytes([MSG_STATS_REPLY]) + json.dumps(stats).encode("utf-8"))
+
+
+def state_deltas(game):
+    """Deltas that rebuild the whole board from empty, for new viewers."""
+    deltas = []
+    for snake in game.snakes:
+        if snake.alive:
+            for x, y in reversed(snake.body):
+                deltas.append((DELTA_HEAD, snake.sid, x, y))
+        deltas.append((DELTA_SCORE, snake.sid, snake.stats.score))
+    deltas.append((DELTA_FOOD, 0) + game.food)
+    for pos, item in game.power_items.items():
+        deltas.append((DELTA_ITEM, ITEM_CODES[item.type]) + pos)
+    return deltas
+
+
+def decode_deltas(data, offset=0):
+    """Yield delta tuples from a packed buffer."""
+    for start in range(offset, len(data) - DELTA.size + 1, DELTA.size):
+        if data[start] == DELTA_SCORE:
+            yield SCORE_DELTA.unpack_from(data, start)
+        else:
+            yield DELTA.unpack_from(data, start)
+
+
+def decode_join(payload):
+    """The room a JOIN asks for; raises ValueError if it is not UTF-8."""
+    return payload[1:].decode("utf-8") or "lobby"
+
+
+def decode_input(payload):
+    """The direction of an INPUT; raises ValueError if it is malformed."""
+    if len(payload) != 2:
+        raise ValueError(f"INPUT of {len(payload)} bytes, expected 2")
+    return DIRECTIONS[payload[1] % len(DIRECTIONS)]
+
+
+def decode_welcome(payload):
+    _, sid, width, height = WELCOME.unpack_from(payload)
+    rows = payload[WELCOME.size :].decode("utf-8").split("\n")
+    return sid, width, height, rows
@@ -0,0 +1,97 @@
+# recorder.py
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+from rich.console import Console
+
+console = Console()
+
+RECORDINGS_DIR = "recordings"
+FLUSH_INTERVAL = 0.5  # Seconds of frames gathered into each batched write.
+BUFFER_SIZE = 64 * 1024
+CLOSE_TIMEOUT = 2.0  # Seconds close waits for the last batch to be written.
+
+
+class Recorder:
+    """Record a game's terminal output as an asciicast v2 file.
+
+    write only timestamps a frame and puts it on a queue. A background
+    thread wakes every FLUSH_INTERVAL, encodes everything queued since,
+    and writes it as one batch, so the game loop never waits on the disk.
+    Play recordings back with asciinema play or any asciicast player.
+    """
+
+    def __init__(self, width, height, title="Snake Game", directory=RECORDINGS_DIR):
+        now = datetime.datetime.now()
+        self.path = os.path.join(directory, now.strftime("snake-%Y%m%d-%H%M%S.cast"))
+        self.header = {
+            "version": 2,
+            "width": width,
+            "height": height,
+            "timestamp": int(now.timestamp()),
+            "title": title,
+            "env": {"TERM": os.environ.get("TERM", "xterm-256color")},
+        }
+        self.queue = queue.SimpleQueue()
+        self.started = time.perf_counter()
+        # A daemon thread, so a game that dies without closing cannot hang exit.
+        self.thread = threading.Thread(target=self.run, name="recorder", daemon=True)
+        self.thread.start()
+
+    def write(self, data):
+        self.queue.put((time.perf_counter() - self.started, data))
+
+    def close(self):
+        """Finish the file, waiting at most CLOSE_TIMEOUT for queued frames."""
+        self.queue.put(None)
+        self.thread.join(CLOSE_TIMEOUT)
+
+    def run(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with self.open_new() as f:
+                f.write(json.dumps(self.header) + "\n")
+                while self.write_batch(f):
+                    time.sleep(FLUSH_INTERVAL)
+        except OSError as e:
+            console.print(f"[red]Error recording game: {e}[/red]")
+            # Keep emptying the queue so frames do not pile up in memory.
+            while self.queue.get() is not None:
+                pass
+
+    def open_new(self):
+        """Create the file, adding -1, -2... to the name if it is taken.
+
+        Names only go down to the second, so a game restarted quickly
+        would otherwise overwrite the last one's recording.
+        """
+        base, ext = os.path.splitext(self.path)
+        suffix = 0
+        while True:
+            try:
+                return open(self.path, "x", encoding="utf-8", buffering=BUFFER_SIZE)
+            except FileExistsError:
+                suffix += 1
+                self.path = f"{base}-{suffix}{ext}"
+
+    def write_batch(self, f):
+        """Write every queued frame; False once the recording is closed."""
+        events = [self.queue.get()]
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        lines = []
+        for event in events:
+            if event is None:
+                break
+            elapsed, data = event
+            lines.append(json.dumps([round(elapsed, 6), "o", data], ensure_ascii=False))
+        if lines:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+        return events[-1] is not None
@@ -0,0 +1,240 @@
+# server.py
+import argparse
+import asyncio
+import copy
+import time
+from collections import deque
+from rich.console import Console
+import levels
+import protocol
+from multiplayer import MAX_SNAKES, MIN_SNAKES, MultiSnakeGame
+from settings import DEFAULT_SETTINGS, SPEED_MAP
+
+console = Console()
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7878
+ROUND_PAUSE = 3.0  # Seconds between the end of a round and the next one.
+MAX_BUFFERED = 64 * 1024  # Clients further behind than this are dropped.
+
+
+class TickStats:
+    """Rolling tick timings shared by every room on a server."""
+
+    def __init__(self, window=4096):
+        self.ticks = 0
+        self.durations = deque(maxlen=window)
+        self.lateness = deque(maxlen=window)
+        self.max_duration = 0.0
+
+    def record(self, duration, lateness):
+        self.ticks += 1
+        self.durations.append(duration)
+        self.lateness.append(lateness)
+        if duration > self.max_duration:
+            self.max_duration = duration
+
+    @staticmethod
+    def percentile(values, fraction):
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self):
+        """Timings in milliseconds over the most recent ticks."""
+        durations = list(self.durations)
+        lateness = list(self.lateness)
+        mean = sum(durations) / len(durations) if durations else 0.0
+        return {
+            "ticks": self.ticks,
+            "tick_mean_ms": mean * 1000,
+            "tick_p50_ms": self.percentile(durations, 0.5) * 1000,
+            "tick_p99_ms": self.percentile(durations, 0.99) * 1000,
+            "tick_max_ms": self.max_duration * 1000,
+            "late_p50_ms": self.percentile(lateness, 0.5) * 1000,
+            "late_p99_ms": self.percentile(lateness, 0.99) * 1000,
+        }
+
+
+class Room:
+    """One authoritative game with its own tick task."""
+
+    def __init__(self, name, server):
+        self.name = name
+        self.server = server
+        self.clients = []  # Stream writers, in join order.
+        self.players = {}  # Stream writer -> snake id for the current round.
+        self.game = None
+        self.tick = 0
+        self.task = None
+
+    def add(self, writer):
+        self.clients.append(writer)
+        self.send(writer, protocol.encode_welcome(protocol.NO_SNAKE, self.server.level))
+        if self.game is not None:
+            self.send(
+                writer,
+                protocol.encode_tick(self.tick, protocol.state_deltas(self.game)),
+            )
+
+    def remove(self, writer):
+        if writer in self.clients:
+            self.clients.remove(writer)
+        sid = self.players.pop(writer, None)
+        if sid is not None and self.game is not None:
+            self.game.snakes[sid].human = False  # A bot takes over the snake.
+
+    def steer(self, writer, direction):
+        sid = self.players.get(writer)
+        if sid is not None and self.game is not None:
+            self.game.steer(sid, direction)
+
+    def send(self, writer, data):
+        if writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+            # Never let a slow client hold up the tick; drop it instead.
+            self.remove(writer)
+            writer.close()
+            return
+        writer.write(data)
+
+    def broadcast(self, data):
+        for writer in list(self.clients):
+            self.send(writer, data)
+
+    def start_round(self):
+        bots = self.server.bots
+        humans = self.clients[: MAX_SNAKES - bots]
+        self.game = MultiSnakeGame(self.server.settings, len(humans), bots)
+        self.game.sound = False
+        self.players = {writer: sid for sid, writer in enumerate(humans)}
+        self.tick = 0
+        state = protocol.encode_tick(0, protocol.state_deltas(self.game))
+        for writer in list(self.clients):
+            sid = self.players.get(writer, protocol.NO_SNAKE)
+            self.send(writer, protocol.encode_welcome(sid, self.server.level) + state)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        stats = self.server.stats
+        try:
+            while self.clients:
+                if len(self.clients) + self.server.bots < MIN_SNAKES:
+                    await asyncio.sleep(0.1)
+                    continue
+                self.start_round()
+                game = self.game
+                next_tick = loop.time()
+                while not game.game_over and self.players:
+                    next_tick += game.delay
+                    await asyncio.sleep(max(0, next_tick - loop.time()))
+                    start = loop.time()
+                    game.update()
+                    self.tick += 1
+                    self.broadcast(protocol.encode_tick(self.tick, game.deltas))
+                    stats.record(loop.time() - start, start - next_tick)
+                winner = game.standings()[0]
+                self.broadcast(protocol.encode_over(winner.sid))
+                self.game = None
+                await asyncio.sleep(ROUND_PAUSE)
+        except Exception as e:
+            console.print(f"[red]Error in room {self.name}: {e}[/red]")
+        finally:
+            self.server.rooms.pop(self.name, None)
+
+
+class GameServer:
+    """Headless server hosting many rooms in one event loop."""
+
+    def __init__(self, bots=0, speed="Fast", level=levels.DEFAULT_LEVEL):
+        self.bots = bots
+        self.settings = copy.deepcopy(DEFAULT_SETTINGS)
+        self.settings["2"]["value"] = speed
+        self.settings["9"]["value"] = level
+        self.level = levels.load_level(level)
+        self.rooms = {}
+        self.stats = TickStats()
+        self.started = time.time()
+
+    def join(self, name, writer):
+        room = self.rooms.get(name)
+        if room is None:
+            room = self.rooms[name] = Room(name, self)
+        room.add(writer)
+        if room.task is None:
+            room.task = asyncio.ensure_future(room.run())
+        return room
+
+    def summary(self):
+        summary = self.stats.summary()
+        summary["rooms"] = len(self.rooms)
+        summary["clients"] = sum(len(room.clients) for room in self.rooms.values())
+        summary["uptime_s"] = time.time() - self.started
+        summary["ticks_per_s"] = summary["ticks"] / max(summary["uptime_s"], 1e-9)
+        return summary
+
+    async def handle_client(self, reader, writer, room_name=None):
+        """Serve one connection; room_name joins a room without a JOIN message."""
+        room = None
+        try:
+            if room_name is not None:
+                room = self.join(room_name, writer)
+            while True:
+                payload = await protocol.read_message(reader)
+                if not payload:
+                    continue
+                kind = payload[0]
+                if kind == protocol.MSG_JOIN and room is None:
+                    room = self.join(protocol.decode_join(payload), writer)
+                elif kind == protocol.MSG_INPUT and room is not None:
+                    room.steer(writer, protocol.decode_input(payload))
+                elif kind == protocol.MSG_STATS:
+                    writer.write(protocol.encode_stats_reply(self.summary()))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ValueError as e:
+            console.print(f"[yellow]Dropped client sending a bad message: {e}[/yellow]")
+        finally:
+            if room is not None:
+                room.remove(writer)
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+async def serve(args):
+    server = GameServer(bots=args.bots, speed=args.speed, level=args.level)
+    listener = await server.start(args.host, args.port)
+    console.print(f"[green]Snake server listening on {args.host}:{args.port}[/green]")
+    async with listener:
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            summary = server.summary()
+            console.print(
+                f"rooms={summary['rooms']} clients={summary['clients']} "
+                f"ticks={summary['ticks']} p50={summary['tick_p50_ms']:.3f}ms "
+                f"p99={summary['tick_p99_ms']:.3f}ms late_p99={summary['late_p99_ms']:.3f}ms"
+            )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Snake Game Adventure server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--bots", type=int, default=0, help="AI snakes per room")
+    parser.add_argument("--speed", choices=list(SPEED_MAP), default="Fast")
+    parser.add_argument("--level", default=levels.DEFAULT_LEVEL)
+    parser.add_argument("--stats-interval", type=float, default=10.0)
+    return parser
+
+
+def parse_args(argv=None):
+    return build_parser().parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
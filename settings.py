@@ -1,12 +1,29 @@
 # settings.py
 import os
 import json
+import time
 from rich.console import Console
+import daily
+import levels
+import metrics
+from streamstats import ModeStats
 
 console = Console()
 
 SETTINGS_FILE = "settings.json"
 SCORE_FILE = "score.json"
+SCHEMA_VERSION = 2  # Version of settings.json written by save_settings.
+
+SPEED_MAP = {"Slow": 0.2, "Normal": 0.1, "Fast": 0.05}
+DIFFICULTY_FACTORS = {"Easy": 1.2, "Normal": 1.0, "Hard": 0.8}
+# (food, power-up, power-down) points for each mode.
+POINTS = {
+    "classic": (10, 20, 5),
+    "time_attack": (15, 25, 7),
+    "survival": (20, 30, 10),
+    "daily": (20, 30, 10),
+    "multiplayer": (20, 30, 10),
+}
 
 DEFAULT_SETTINGS = {
     "1": {
@@ -27,7 +44,7 @@ DEFAULT_SETTINGS = {
     "3": {
         "name": "Theme",
         "type": "choice",
-        "choices": ["Default", "Rainbow", "Dark"],
+        "choices": ["Default", "Rainbow", "Dark", "Sunset", "Waves"],
         "save": True,
         "default": "Default",
         "value": "Default",
@@ -69,7 +86,182 @@ DEFAULT_SETTINGS = {
         "default": "Art 1",
         "value": "Art 1",
     },
+    "9": {
+        "name": "Level",
+        "type": "choice",
+        "choices": levels.available_levels(),
+        "save": True,
+        "default": levels.DEFAULT_LEVEL,
+        "value": levels.DEFAULT_LEVEL,
+    },
+    "10": {
+        "name": "Spectator Broadcast",
+        "type": "toggle",
+        "save": True,
+        "default": False,
+        "value": False,
+    },
+    "11": {
+        "name": "Assist (Single Player)",
+        "type": "choice",
+        "choices": ["Off", "Hint", "Autopilot"],
+        "save": True,
+        "default": "Off",
+        "value": "Off",
+    },
+    "12": {
+        "name": "Assist Think Time (ms)",
+        "type": "choice",
+        "choices": ["5", "10", "20", "40"],
+        "save": True,
+        "default": "10",
+        "value": "10",
+    },
+    "13": {
+        "name": "Memory Tracking (slower)",
+        "type": "toggle",
+        "save": True,
+        "default": False,
+        "value": False,
+    },
+    "14": {
+        "name": "Metrics Exporter",
+        "type": "toggle",
+        "save": True,
+        "default": False,
+        "value": False,
+    },
+    "15": {
+        "name": "Record Games (asciicast)",
+        "type": "toggle",
+        "save": True,
+        "default": False,
+        "value": False,
+    },
+    "16": {
+        "name": "Low-Latency Audio",
+        "type": "toggle",
+        "save": True,
+        "default": False,
+        "value": False,
+    },
 }
+# Settings a daily challenge always plays with, so scores on a day's
+# leaderboard compare: speed up on, Normal speed and difficulty, no wall
+# wrapping, the default level and no assist.
+DAILY_SETTINGS = {
+    "1": True,
+    "2": "Normal",
+    "5": False,
+    "7": "Normal",
+    "9": levels.DEFAULT_LEVEL,
+    "11": "Off",
+}
+
+
+def checked_value(key, value):
+    """value for setting key, or the setting's default if it is not valid."""
+    option = DEFAULT_SETTINGS[key]
+    if value is None:
+        return option["default"]
+    if option["type"] == "toggle":
+        return bool(value)
+    return value if value in option["choices"] else option["default"]
+
+
+class GameConfig:
+    """The settings one game runs with, checked and compiled at game start.
+
+    Engines read these attributes instead of looking settings up by key on
+    every tick. Values derived from several settings, such as the starting
+    delay and the points for the mode, are worked out here once. A config
+    cannot be changed; the next game compiles a new one.
+    """
+
+    __slots__ = (
+        "mode",
+        "level",
+        "theme",
+        "invert",
+        "wrap",
+        "difficulty",
+        "delay",
+        "speed_up",
+        "food_points",
+        "powerup_points",
+        "powerdown_points",
+        "assist",
+        "think_time",
+        "record",
+        "day",
+    )
+
+    def __init__(self, options, mode):
+        def read(key):
+            if mode == "daily" and key in DAILY_SETTINGS:
+                return DAILY_SETTINGS[key]
+            option = options.get(key)
+            return checked_value(key, None if option is None else option["value"])
+
+        set_field = object.__setattr__
+        set_field(self, "mode", mode)
+        set_field(self, "level", read("9"))
+        set_field(self, "theme", read("3"))
+        set_field(self, "invert", read("4"))
+        # Wall wrapping only applies to Classic mode.
+        set_field(self, "wrap", mode == "classic" and read("5"))
+        difficulty = read("7")
+        set_field(self, "difficulty", difficulty)
+        speed = SPEED_MAP[read("2")]
+        set_field(self, "delay", speed * DIFFICULTY_FACTORS[difficulty])
+        # Factor applied to the delay per food eaten, or None.
+        speed_up = None
+        if read("1"):
+            speed_up = 0.97 if mode in ("survival", "daily") else 0.98
+        set_field(self, "speed_up", speed_up)
+        points = POINTS.get(mode, POINTS["survival"])
+        set_field(self, "food_points", points[0])
+        set_field(self, "powerup_points", points[1])
+        set_field(self, "powerdown_points", points[2])
+        set_field(self, "assist", read("11"))
+        set_field(self, "think_time", int(read("12")) / 1000)
+        set_field(self, "record", read("15"))
+        # The date is fixed at game start, so a run past midnight counts
+        # for the day it began.
+        set_field(self, "day", daily.today() if mode == "daily" else None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"GameConfig is read-only: cannot set {name}")
+
+
+def migrate_v1(data):
+    """Version 1 files are the same keys without a version field."""
+    return data
+
+
+# Version -> function turning that version's data into the next version's.
+MIGRATIONS = {1: migrate_v1}
+
+
+def migrate_settings(data):
+    """Bring the contents of settings.json up to SCHEMA_VERSION.
+
+    Returns the migrated data and whether any step changed it.
+    """
+    data = dict(data)
+    version = data.pop("version", 1)
+    if version > SCHEMA_VERSION:
+        console.print(
+            f"[red]Error loading settings: version {version} is newer than "
+            f"{SCHEMA_VERSION}; unknown settings are ignored.[/red]"
+        )
+    changed = False
+    while version < SCHEMA_VERSION:
+        migrated = MIGRATIONS[version](dict(data))
+        changed = changed or migrated != data
+        data = migrated
+        version += 1
+    return data, changed
 
 
 class SettingsManager:
@@ -85,28 +277,31 @@ class SettingsManager:
             try:
                 with open(self.filename, "r") as f:
                     data = json.load(f)
-                    for key, option in self.options.items():
-                        if key in data:
-                            if option["type"] == "toggle":
-                                option["value"] = bool(data[key])
-                            else:
-                                option["value"] = data[key]
+                data, changed = migrate_settings(data)
+                for key, option in self.options.items():
+                    if key in data:
+                        option["value"] = checked_value(key, data[key])
+                if changed:
+                    self.save_settings()
             except Exception as e:
                 console.print(f"[red]Error loading settings: {e}[/red]")
         else:
             self.save_settings()
 
     def save_settings(self):
-        data = {
-            key: option["value"]
+        data = {"version": SCHEMA_VERSION}
+        data.update(
+            (key, option["value"])
             for key, option in self.options.items()
             if option.get("save", False)
-        }
+        )
+        started = time.perf_counter()
         try:
             with open(self.filename, "w") as f:
                 json.dump(data, f, indent=4)
         except Exception as e:
             console.print(f"[red]Error saving settings: {e}[/red]")
+        metrics.WRITE_SECONDS.observe(time.perf_counter() - started, "settings")
 
     def update_setting(self, key, value):
         if key in self.options:
@@ -128,6 +323,7 @@ class ScoreManager:
             "classic": {"last": 0, "high": 0},
             "time_attack": {"last": 0, "high": 0},
             "survival": {"last": 0, "high": 0},
+            "multiplayer": {"last": 0, "high": 0},
             "combined": {"last": 0, "high": 0},
             "statistics": {
                 "total_games": 0,
@@ -144,6 +340,9 @@ class ScoreManager:
                 "total_powerdowns": 0,
             },
         }
+        # Mode -> streaming score and duration aggregates, saved under
+        # "distributions".
+        self.distributions = {}
         self.load_scores()
 
     def load_scores(self):
@@ -151,23 +350,34 @@ class ScoreManager:
             try:
                 with open(self.filename, "r") as f:
                     self.scores = json.load(f)
+                self.distributions = {
+                    mode: ModeStats(data)
+                    for mode, data in self.scores.get("distributions", {}).items()
+                }
             except Exception as e:
                 console.print(f"[red]Error loading scores: {e}[/red]")
         else:
             self.save_scores()
 
     def save_scores(self):
+        self.scores["distributions"] = {
+            mode: dist.to_dict() for mode, dist in self.distributions.items()
+        }
+        started = time.perf_counter()
         try:
             with open(self.filename, "w") as f:
                 json.dump(self.scores, f, indent=4)
         except Exception as e:
             console.print(f"[red]Error saving scores: {e}[/red]")
+        metrics.WRITE_SECONDS.observe(time.perf_counter() - started, "scores")
 
     def update_score(self, mode, game_stats):
+        metrics.GAMES.inc(value=mode)
         # Update per-mode scores.
-        self.scores[mode]["last"] = game_stats["score"]
-        if game_stats["score"] > self.scores[mode]["high"]:
-            self.scores[mode]["high"] = game_stats["score"]
+        self.scores.setdefault(mode, {"last": 0, "high": 0})
+        self.scores[mode]["last"] = game_stats.score
+        if game_stats.score > self.scores[mode]["high"]:
+            self.scores[mode]["high"] = game_stats.score
         # Update combined scores.
         self.scores["combined"]["last"] = (
             self.scores["classic"]["last"]
@@ -179,33 +389,61 @@ class ScoreManager:
             + self.scores["time_attack"]["high"]
             + self.scores["survival"]["high"]
         )
+        # Update the distributions and rolling windows.
+        dist = self.distributions.get(mode)
+        if dist is None:
+            dist = self.distributions[mode] = ModeStats()
+        dist.update(game_stats.score, game_stats.duration)
         # Update additional statistics.
         stats = self.scores["statistics"]
         stats["total_games"] += 1
-        stats["total_playtime"] += game_stats["duration"]
-        if game_stats["duration"] > stats["longest_game"]:
-            stats["longest_game"] = game_stats["duration"]
-        stats["total_max_length"] += game_stats["max_length"]
-        stats["total_collisions"] += game_stats["collisions"]
-        stats["total_food_eaten"] += game_stats["food_eaten"]
-        stats["total_powerups"] += game_stats["powerups"]
-        stats["total_powerdowns"] += game_stats["powerdowns"]
+        stats["total_playtime"] += game_stats.duration
+        if game_stats.duration > stats["longest_game"]:
+            stats["longest_game"] = game_stats.duration
+        stats["total_max_length"] += game_stats.max_length
+        stats["total_collisions"] += game_stats.collisions
+        stats["total_food_eaten"] += game_stats.food_eaten
+        stats["total_powerups"] += game_stats.powerups
+        stats["total_powerdowns"] += game_stats.powerdowns
         if mode == "classic":
-            lives_lost = 3 - game_stats["lives_remaining"]
+            lives_lost = 3 - game_stats.lives_remaining
             stats["total_lives_lost"] += lives_lost
-            if game_stats["won"]:
+            if game_stats.won:
                 stats["games_won"] += 1
         if mode == "time_attack":
             stats["time_attack_games"] = stats.get("time_attack_games", 0) + 1
-            if game_stats["won"]:
+            if game_stats.won:
                 stats["time_attack_wins"] = stats.get("time_attack_wins", 0) + 1
+        if game_stats.day is not None:
+            self.add_daily_score(game_stats)
         self.save_scores()
 
+    def add_daily_score(self, game_stats):
+        """Enter a daily challenge score on its day's leaderboard."""
+        boards = self.scores.setdefault("daily_leaderboards", {})
+        board = boards.setdefault(game_stats.day, [])
+        board.append(
+            {
+                "score": game_stats.score,
+                "duration": round(game_stats.duration, 1),
+                "time": time.strftime("%H:%M:%S"),
+            }
+        )
+        board.sort(key=lambda entry: -entry["score"])
+        del board[daily.LEADERBOARD_SIZE :]
+        # ISO dates sort by age; drop the oldest days beyond the limit.
+        for day in sorted(boards)[: -daily.LEADERBOARD_DAYS]:
+            del boards[day]
+
+    def daily_leaderboard(self, day):
+        return self.scores.get("daily_leaderboards", {}).get(day, [])
+
     def clear_scores(self):
         self.scores = {
             "classic": {"last": 0, "high": 0},
             "time_attack": {"last": 0, "high": 0},
             "survival": {"last": 0, "high": 0},
+            "multiplayer": {"last": 0, "high": 0},
             "combined": {"last": 0, "high": 0},
             "statistics": {
                 "total_games": 0,
@@ -222,4 +460,5 @@ class ScoreManager:
                 "total_powerdowns": 0,
             },
         }
+        self.distributions = {}
         self.save_scores()
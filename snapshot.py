@@ -0,0 +1,257 @@
+# snapshot.py
+import os
+import struct
+import time
+from rich.console import Console
+import levels
+import metrics
+from state import DIRECTIONS, GameStats, ItemType, PowerItem
+
+console = Console()
+
+SAVE_FILE = "savegame.bin"
+MAGIC = b"SNK"
+VERSION = 1
+
+MODES = ["classic", "time_attack", "survival"]
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+ITEM_TYPES = [ItemType.POWERUP, ItemType.POWERDOWN]
+ITEM_CODES = {item_type: code for code, item_type in enumerate(ITEM_TYPES)}
+# Bit positions for the achievements unlocked during the current game.
+ACHIEVEMENT_BITS = [
+    "Food Frenzy",
+    "Long Snake",
+    "Marathon",
+    "Combo Master",
+    "Speed Demon",
+]
+
+HEADER = struct.Struct("<3sBB")
+# score, cumulative score, lives, elapsed, time limit, delay, direction,
+# consecutive food, achievement bits, then the GameStats counters.
+FIELDS = struct.Struct("<IIBdHdBHBHHHHH")
+POINT = struct.Struct("<BB")
+BODY = struct.Struct("<BBH")
+ITEM = struct.Struct("<BBB")
+RNG = struct.Struct("<B625IBd")
+
+
+def snapshot(game):
+    """Pack the state of a single-player SnakeGame into bytes."""
+    level_name = game.level.name.encode("utf-8")
+    parts = [
+        HEADER.pack(MAGIC, VERSION, MODES.index(game.mode)),
+        bytes([len(level_name)]),
+        level_name,
+    ]
+    achievements = 0
+    for bit, name in enumerate(ACHIEVEMENT_BITS):
+        if name in game.achievements_unlocked:
+            achievements |= 1 << bit
+    stats = game.stats
+    parts.append(
+        FIELDS.pack(
+            game.score,
+            getattr(game, "cumulative_score", 0),
+            getattr(game, "lives", 0),
+            game.clock() - game.start_time,
+            getattr(game, "time_limit", 0),
+            game.delay,
+            DIRECTION_CODES[game.direction],
+            game.consecutive_food,
+            achievements,
+            stats.max_length,
+            stats.collisions,
+            stats.food_eaten,
+            stats.powerups,
+            stats.powerdowns,
+        )
+    )
+    parts.append(POINT.pack(*game.food))
+    parts.append(BODY.pack(*game.snake[0], len(game.snake)))
+    parts.append(encode_body(game))
+    parts.append(bytes([len(game.power_items)]))
+    for (x, y), item in game.power_items.items():
+        parts.append(ITEM.pack(x, y, ITEM_CODES[item.type]))
+    version, internal, gauss = game.rng.getstate()
+    parts.append(RNG.pack(version, *internal, gauss is not None, gauss or 0.0))
+    return b"".join(parts)
+
+
+def step(level, pos, direction):
+    """The cell one move away, wrapping inside the walls like the game does."""
+    x = (pos[0] + direction[0] - 1) % (level.width - 2) + 1
+    y = (pos[1] + direction[1] - 1) % (level.height - 2) + 1
+    return (x, y)
+
+
+def base_cell(level, pos):
+    # A segment on a portal arrived through its twin, so its neighbour
+    # towards the tail sits next to the twin.
+    idx = level.index(pos)
+    if idx in level.portals:
+        return level.position(level.portals[idx])
+    return pos
+
+
+def encode_body(game):
+    """Encode the body as 2-bit directions from each segment to the next."""
+    level = game.level
+    portals = level.portals
+    width = level.width
+    bits = 0
+    shift = 0
+    for (x, y), (next_x, next_y) in zip(game.snake, game.snake[1:]):
+        idx = y * width + x
+        if idx in portals:
+            x, y = level.position(portals[idx])
+        dx = next_x - x
+        dy = next_y - y
+        # A jump across the board is a single step through a wrapped wall.
+        if dx > 1:
+            dx = -1
+        elif dx < -1:
+            dx = 1
+        if dy > 1:
+            dy = -1
+        elif dy < -1:
+            dy = 1
+        code = DIRECTION_CODES.get((dx, dy))
+        if code is None:
+            raise ValueError("snake body is not contiguous")
+        bits |= code << shift
+        shift += 2
+    return bits.to_bytes((shift + 7) // 8, "little")
+
+
+def decode_body(level, head, length, data):
+    bits = int.from_bytes(data, "little")
+    body = [head]
+    for i in range(length - 1):
+        direction = DIRECTIONS[(bits >> (2 * i)) & 3]
+        body.append(step(level, base_cell(level, body[-1]), direction))
+    return body
+
+
+def peek_mode(data):
+    magic, version, mode = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a compatible save")
+    return MODES[mode]
+
+
+def restore(game, data):
+    """Load a snapshot into an existing game of the same mode."""
+    if peek_mode(data) != game.mode:
+        raise ValueError("snapshot was taken in a different mode")
+    offset = HEADER.size
+    name_length = data[offset]
+    offset += 1
+    level_name = data[offset : offset + name_length].decode("utf-8")
+    offset += name_length
+    if level_name != game.level.name:
+        game.level = levels.load_level(level_name)
+        game.board_width = game.level.width
+        game.board_height = game.level.height
+        game.load_theme()
+    level = game.level
+    (
+        game.score,
+        cumulative_score,
+        lives,
+        elapsed,
+        time_limit,
+        game.delay,
+        direction,
+        game.consecutive_food,
+        achievements,
+        max_length,
+        collisions,
+        food_eaten,
+        powerups,
+        powerdowns,
+    ) = FIELDS.unpack_from(data, offset)
+    offset += FIELDS.size
+    if game.mode == "classic":
+        game.cumulative_score = cumulative_score
+        game.lives = lives
+    if game.mode == "time_attack":
+        game.time_limit = time_limit
+    game.start_time = game.clock() - elapsed
+    game.time_up = False
+    game.game_over = False
+    game.direction = DIRECTIONS[direction]
+    game.achievements_unlocked = {
+        name for bit, name in enumerate(ACHIEVEMENT_BITS) if achievements >> bit & 1
+    }
+    game.stats = GameStats(max_length)
+    game.stats.collisions = collisions
+    game.stats.food_eaten = food_eaten
+    game.stats.powerups = powerups
+    game.stats.powerdowns = powerdowns
+    game.food = POINT.unpack_from(data, offset)
+    offset += POINT.size
+    head_x, head_y, length = BODY.unpack_from(data, offset)
+    offset += BODY.size
+    body_size = (2 * (length - 1) + 7) // 8
+    game.snake = decode_body(
+        level, (head_x, head_y), length, data[offset : offset + body_size]
+    )
+    offset += body_size
+    game.grid = bytearray(level.grid)
+    for pos in game.snake:
+        game.grid[level.index(pos)] = levels.SNAKE
+    game.power_items = {}
+    for _ in range(data[offset]):
+        x, y, code = ITEM.unpack_from(data, offset + 1)
+        game.power_items[(x, y)] = PowerItem((x, y), ITEM_TYPES[code])
+        offset += ITEM.size
+    offset += 1
+    values = RNG.unpack_from(data, offset)
+    gauss = values[-1] if values[-2] else None
+    game.rng.setstate((values[0], tuple(values[1:-2]), gauss))
+    game.screen = None
+
+
+def save_game(game, filename=SAVE_FILE):
+    started = time.perf_counter()
+    try:
+        with open(filename, "wb") as f:
+            f.write(snapshot(game))
+        saved = True
+    except Exception as e:
+        console.print(f"[red]Error saving game: {e}[/red]")
+        saved = False
+    metrics.WRITE_SECONDS.observe(time.perf_counter() - started, "save")
+    return saved
+
+
+def load_game(filename=SAVE_FILE):
+    """Return the saved snapshot, or None if there is none.
+
+    The file stays until the resumed game ends (see discard_game) or a new
+    save replaces it, so a resumed game that is interrupted is not lost.
+    """
+    if not os.path.exists(filename):
+        return None
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+        peek_mode(data)
+        return data
+    except Exception as e:
+        console.print(f"[red]Error loading saved game: {e}[/red]")
+        discard_game(filename)  # It would fail the same way every time.
+        return None
+
+
+def discard_game(filename=SAVE_FILE):
+    try:
+        if os.path.exists(filename):
+            os.remove(filename)
+    except OSError as e:
+        console.print(f"[red]Error removing saved game: {e}[/red]")
+
+
+def has_saved_game(filename=SAVE_FILE):
+    return os.path.exists(filename)
@@ -0,0 +1,164 @@
+# soak.py
+import argparse
+import asyncio
+import copy
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import bot
+from game import SnakeGame
+from memwatch import rss_kb
+from multiplayer import MultiSnakeGame
+from settings import DEFAULT_SETTINGS
+
+
+class ScriptedInput:
+    """Press keys from a script; ticks count from the start of each game."""
+
+    def __init__(self, events, repeat=False):
+        self.events = events  # Tick -> tuple of keys.
+        self.period = max(events) + 1 if repeat and events else None
+
+    def __call__(self, game):
+        tick = game.frame
+        if self.period:
+            tick %= self.period
+        return self.events.get(tick, ())
+
+
+class TickLimit:
+    """End each game after max_ticks so a strong autopilot cannot run forever."""
+
+    def __init__(self, max_ticks, inputs=None):
+        self.max_ticks = max_ticks
+        self.inputs = inputs
+
+    def __call__(self, game):
+        if game.frame >= self.max_ticks:
+            game.game_over = True
+            return ()
+        return self.inputs(game) if self.inputs else ()
+
+
+def load_script(filename):
+    """Read "<tick> <key>" lines; blank lines and # comments are skipped."""
+    events = {}
+    with open(filename, "r") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                tick, key = line.split()
+                events[int(tick)] = events.get(int(tick), ()) + (key,)
+    return events
+
+
+def build_game(args):
+    settings = copy.deepcopy(DEFAULT_SETTINGS)
+    settings["2"]["value"] = args.speed
+    settings["9"]["value"] = args.level
+    settings["11"]["value"] = "Off"
+    if args.mode == "multiplayer":
+        game = MultiSnakeGame(settings, humans=0, bots=args.bots)
+    else:
+        game = SnakeGame(settings, mode=args.mode)
+    game.sound = False
+    inputs = None
+    if args.script:
+        inputs = ScriptedInput(load_script(args.script), repeat=True)
+    elif args.mode != "multiplayer":
+        game.bot = bot.SearchBot(budget=args.think_ms / 1000)
+        game.autopilot = True
+    if args.max_ticks:
+        inputs = TickLimit(args.max_ticks, inputs)
+    game.enable_turbo(render_every=args.render_every, inputs=inputs)
+    return game
+
+
+async def soak(args):
+    """Play many turbo games in one engine and check that memory stays flat."""
+    if args.trace:
+        tracemalloc.start()
+    game = build_game(args)
+    games = 0
+    ticks = 0
+    game_time = 0.0
+    best = 0
+    baseline = None
+    started = time.perf_counter()
+    for n in range(args.warmup + args.games):
+        if n == args.warmup and args.trace:
+            gc.collect()
+            baseline = tracemalloc.take_snapshot()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        stats = await game.run()
+        games += 1
+        ticks += game.frame
+        game_time += stats.duration
+        best = max(best, stats.score)
+    elapsed = time.perf_counter() - started
+    report = {
+        "games": games,
+        "ticks": ticks,
+        "ticks_per_s": ticks / elapsed,
+        "game_hours": game_time / 3600,
+        "wall_s": elapsed,
+        "best_score": best,
+        "rss_kb": rss_kb(),
+    }
+    ok = True
+    if baseline is not None:
+        gc.collect()
+        growth = tracemalloc.get_traced_memory()[0] - traced_before
+        report["traced_growth_kb"] = growth / 1024
+        report["growth_per_game_b"] = growth / max(1, args.games)
+        report["top_growth"] = [
+            str(stat)
+            for stat in tracemalloc.take_snapshot().compare_to(baseline, "lineno")[:5]
+        ]
+        ok = growth <= args.max_growth_kb * 1024
+        tracemalloc.stop()
+    report["ok"] = ok
+    print(json.dumps(report, indent=4))
+    return ok
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Play many unthrottled games to find slowdowns and leaks"
+    )
+    parser.add_argument(
+        "--mode",
+        default="survival",
+        choices=["classic", "time_attack", "survival", "multiplayer"],
+    )
+    parser.add_argument("--level", default="Open")
+    parser.add_argument("--speed", default="Normal")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument(
+        "--warmup", type=int, default=5, help="games played before measuring memory"
+    )
+    parser.add_argument(
+        "--render-every", type=int, default=0, help="draw every Nth frame (0: never)"
+    )
+    parser.add_argument("--script", help='file of "<tick> <key>" lines to replay')
+    parser.add_argument(
+        "--think-ms", type=float, default=1.0, help="autopilot think time per tick"
+    )
+    parser.add_argument(
+        "--max-ticks", type=int, default=20000, help="end a game after this many ticks"
+    )
+    parser.add_argument("--bots", type=int, default=4, help="multiplayer only")
+    parser.add_argument("--no-trace", dest="trace", action="store_false")
+    parser.add_argument(
+        "--max-growth-kb",
+        type=float,
+        default=256.0,
+        help="fail if traced memory grows more than this after warm-up",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(soak(parse_args())) else 1)
@@ -0,0 +1,139 @@
+# spectate.py
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from rich.console import Console
+
+console = Console()
+
+SPECTATE_HOST = "127.0.0.1"
+SPECTATE_PORT = 7880
+SPECTATE_SOCKET = os.path.join(tempfile.gettempdir(), "snake-game-spectate.sock")
+MAX_BUFFERED = 256 * 1024  # A viewer this far behind skips frames.
+
+
+class Viewer:
+    """One attached spectator connection."""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.synced = False  # False until the viewer has a full screen.
+        self.dropped = 0
+
+
+class Broadcaster:
+    """Fan the game's rendered frames out to spectators.
+
+    Each frame is encoded once and the same bytes are written to every
+    viewer. A viewer whose socket buffer is full misses frames rather than
+    slowing the game down, then gets a full frame once it catches up.
+    """
+
+    def __init__(self, host=SPECTATE_HOST, port=SPECTATE_PORT, path=SPECTATE_SOCKET):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.viewers = []
+        self.servers = []
+        self.frames = 0
+
+    async def start(self):
+        try:
+            self.servers.append(
+                await asyncio.start_server(self.attach, self.host, self.port)
+            )
+            if self.path and hasattr(asyncio, "start_unix_server"):
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                self.servers.append(
+                    await asyncio.start_unix_server(self.attach, self.path)
+                )
+        except OSError as e:
+            console.print(f"[red]Error starting spectator broadcast: {e}[/red]")
+
+    def close(self):
+        for server in self.servers:
+            server.close()
+        for viewer in self.viewers:
+            viewer.writer.close()
+        self.servers = []
+        self.viewers = []
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    async def attach(self, reader, writer):
+        viewer = Viewer(writer)
+        self.viewers.append(viewer)
+        try:
+            # Viewers never send anything; this returns when they disconnect.
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            if viewer in self.viewers:
+                self.viewers.remove(viewer)
+            writer.close()
+
+    def publish(self, frame, full_frame):
+        """Send a delta frame; full_frame() is only called for new viewers."""
+        if not self.viewers:
+            return
+        self.frames += 1
+        data = frame.encode("utf-8")
+        keyframe = None
+        for viewer in self.viewers:
+            transport = viewer.writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > MAX_BUFFERED:
+                viewer.dropped += 1
+                viewer.synced = False
+                continue
+            if viewer.synced:
+                viewer.writer.write(data)
+            else:
+                if keyframe is None:
+                    keyframe = full_frame().encode("utf-8")
+                viewer.writer.write(keyframe)
+                viewer.synced = True
+
+
+async def watch(host, port, path):
+    """Copy a broadcast straight to this terminal."""
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    output = sys.stdout.buffer
+    while True:
+        data = await reader.read(65536)
+        if not data:
+            break
+        output.write(data)
+        output.flush()
+    writer.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a Snake Game broadcast")
+    parser.add_argument("--host", default=SPECTATE_HOST)
+    parser.add_argument("--port", type=int, default=SPECTATE_PORT)
+    parser.add_argument(
+        "--socket",
+        nargs="?",
+        const=SPECTATE_SOCKET,
+        default=None,
+        help="connect through the Unix socket instead of TCP",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        asyncio.run(watch(args.host, args.port, args.socket))
+    except (KeyboardInterrupt, ConnectionError, FileNotFoundError):
+        print("\nStopped watching.")
@@ -0,0 +1,77 @@
+# state.py
+import enum
+
+# The four moves. Their order gives the direction codes used in save files
+# and in the network protocol.
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+
+class ItemType(enum.Enum):
+    POWERUP = "powerup"
+    POWERDOWN = "powerdown"
+
+
+class PowerItem:
+    """A power item on the board, stored in a dict keyed by its position."""
+
+    __slots__ = ("pos", "type")
+
+    def __init__(self, pos, item_type):
+        self.pos = pos
+        self.type = item_type
+
+
+class GameStats:
+    """Per-game counters, returned by SnakeGame.run when the game ends."""
+
+    __slots__ = (
+        "score",
+        "duration",
+        "max_length",
+        "collisions",
+        "food_eaten",
+        "powerups",
+        "powerdowns",
+        "lives_remaining",
+        "won",
+        "standings",
+        "day",
+    )
+
+    def __init__(self, max_length=0):
+        self.score = 0
+        self.duration = 0.0
+        self.max_length = max_length
+        self.collisions = 0
+        self.food_eaten = 0
+        self.powerups = 0
+        self.powerdowns = 0
+        self.lives_remaining = None
+        self.won = False
+        self.standings = None  # Multiplayer only: final order of the snakes.
+        self.day = None  # Daily challenge only: the ISO date played.
+
+
+class SnakeState:
+    """One snake on a shared board."""
+
+    __slots__ = (
+        "sid",
+        "name",
+        "human",
+        "body",
+        "direction",
+        "next_direction",
+        "alive",
+        "stats",
+    )
+
+    def __init__(self, sid, name, human):
+        self.sid = sid
+        self.name = name
+        self.human = human
+        self.body = []
+        self.direction = (1, 0)  # Direction used for the last move.
+        self.next_direction = (1, 0)
+        self.alive = True
+        self.stats = GameStats()
@@ -0,0 +1,140 @@
+# streamstats.py
+from collections import deque
+
+SUB_BITS = 3  # 8 buckets per power of two: quantiles within about 1/8.
+SUB_BUCKETS = 1 << SUB_BITS
+WINDOW = 100  # Games kept for the rolling averages and trend.
+SPARKS = "▁▂▃▄▅▆▇█"
+
+
+class Histogram:
+    """A log-linear histogram of non-negative values.
+
+    Values are scaled to integers; those below 2 * SUB_BUCKETS get a bucket
+    each and larger ones share SUB_BUCKETS buckets per power of two, so a
+    bucket is found with a few integer operations and a lifetime of games
+    needs a few hundred counters at most. Counts are kept sparse.
+    """
+
+    __slots__ = ("scale", "counts", "total")
+
+    def __init__(self, scale=1, counts=None):
+        self.scale = scale
+        self.counts = {}
+        self.total = 0
+        for index, count in (counts or {}).items():
+            self.counts[int(index)] = count
+            self.total += count
+
+    @staticmethod
+    def bucket(n):
+        if n < 2 * SUB_BUCKETS:
+            return n
+        shift = n.bit_length() - SUB_BITS - 1
+        return SUB_BUCKETS * shift + (n >> shift)
+
+    @staticmethod
+    def bounds(index):
+        """The [low, high) range of scaled values in a bucket."""
+        if index < 2 * SUB_BUCKETS:
+            return index, index + 1
+        shift = index // SUB_BUCKETS - 1
+        mantissa = index - SUB_BUCKETS * shift
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def add(self, value):
+        index = self.bucket(max(0, int(value * self.scale)))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+
+    def quantile(self, q):
+        """The value below which a fraction q of the values fall."""
+        if not self.total:
+            return None
+        rank = q * self.total
+        seen = 0
+        for index in sorted(self.counts):
+            count = self.counts[index]
+            if seen + count >= rank:
+                low, high = self.bounds(index)
+                # Spread the bucket's values evenly across its range.
+                within = (rank - seen) / count
+                return (low + (high - 1 - low) * within) / self.scale
+            seen += count
+        return None
+
+    def to_dict(self):
+        return {"scale": self.scale, "counts": self.counts}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("scale", 1), data.get("counts"))
+
+
+class RollingWindow:
+    """The last size values with their running sum, for O(1) averages."""
+
+    __slots__ = ("values", "sum")
+
+    def __init__(self, size=WINDOW, values=()):
+        self.values = deque(values, maxlen=size)
+        self.sum = sum(self.values)
+
+    def add(self, value):
+        if len(self.values) == self.values.maxlen:
+            self.sum -= self.values[0]
+        self.values.append(value)
+        self.sum += value
+
+    def mean(self):
+        return self.sum / len(self.values) if self.values else None
+
+    def sparkline(self, width=20):
+        """The window as a line of block characters, oldest on the left."""
+        values = list(self.values)
+        if not values:
+            return ""
+        step = max(1, -(-len(values) // width))
+        means = [
+            sum(values[i : i + step]) / len(values[i : i + step])
+            for i in range(0, len(values), step)
+        ]
+        low, high = min(means), max(means)
+        span = (high - low) or 1
+        return "".join(SPARKS[int((m - low) / span * (len(SPARKS) - 1))] for m in means)
+
+
+class ModeStats:
+    """Streaming score and duration aggregates for one game mode.
+
+    update runs in constant time and memory whatever the number of games,
+    and nothing here ever rescans past games.
+    """
+
+    __slots__ = ("scores", "durations", "recent_scores", "recent_durations")
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.scores = Histogram.from_dict(data.get("scores", {}))
+        # Durations are bucketed in tenths of a second.
+        self.durations = Histogram.from_dict(data.get("durations", {"scale": 10}))
+        self.recent_scores = RollingWindow(values=data.get("recent_scores", ()))
+        self.recent_durations = RollingWindow(values=data.get("recent_durations", ()))
+
+    @property
+    def games(self):
+        return self.scores.total
+
+    def update(self, score, duration):
+        self.scores.add(score)
+        self.durations.add(duration)
+        self.recent_scores.add(score)
+        self.recent_durations.add(round(duration, 1))
+
+    def to_dict(self):
+        return {
+            "scores": self.scores.to_dict(),
+            "durations": self.durations.to_dict(),
+            "recent_scores": list(self.recent_scores.values),
+            "recent_durations": list(self.recent_durations.values),
+        }
@@ -0,0 +1,150 @@
+# termcaps.py
+import json
+import os
+import sys
+from rich.console import Console
+
+console = Console()
+
+CAPS_FILE = "termcaps.json"
+CAPS = ("colors", "unicode", "truecolor", "bce")  # What probe finds out.
+
+UNICODE_GLYPHS = {
+    "head": "●",
+    "body": "■",
+    "food": "♥",
+    "powerup": "♦",
+    "powerdown": "▲",
+    "portal": "○",
+    "wall": "█",
+    "up": "↑",
+    "down": "↓",
+    "left": "←",
+    "right": "→",
+}
+ASCII_GLYPHS = {
+    "head": "@",
+    "body": "o",
+    "food": "*",
+    "powerup": "+",
+    "powerdown": "-",
+    "portal": "O",
+    "wall": "#",
+    "up": "^",
+    "down": "v",
+    "left": "<",
+    "right": ">",
+}
+
+caps = None  # Capabilities of this process's terminal, once known.
+styles = {}  # (colors, unicode) -> Styles.
+
+
+def back_color_erase(term):
+    """Whether erased cells take the current background (terminfo bce)."""
+    try:
+        import curses
+
+        try:
+            return curses.tigetflag("bce") > 0
+        except curses.error:
+            # blessed may read terminfo without setting up curses.
+            curses.setupterm(term.kind, sys.__stdout__.fileno())
+            return curses.tigetflag("bce") > 0
+    except Exception:
+        return False
+
+
+def probe(term):
+    """Ask the terminal and environment what can be drawn."""
+    encoding = (getattr(sys.stdout, "encoding", None) or "").lower()
+    colorterm = os.environ.get("COLORTERM", "").lower()
+    colors = term.number_of_colors if term.does_styling else 0
+    return {
+        "colors": colors,
+        "unicode": encoding.startswith("utf"),
+        "truecolor": colors > 0
+        and (colorterm in ("truecolor", "24bit") or colors >= 1 << 24),
+        "bce": colors > 0 and back_color_erase(term),
+    }
+
+
+def load_caps(term, filename=CAPS_FILE):
+    """Capabilities for $TERM, probed once and then read from a cache file.
+
+    Only probes of a real terminal are cached, so a run with piped output
+    cannot leave a colorless entry behind.
+    """
+    global caps
+    if caps is not None:
+        return caps
+    key = os.environ.get("TERM", "unknown")
+    cache = {}
+    if os.path.exists(filename):
+        try:
+            with open(filename, "r") as f:
+                cache = json.load(f)
+        except Exception as e:
+            console.print(f"[red]Error loading terminal capabilities: {e}[/red]")
+    caps = cache.get(key)
+    # Entries written before a capability was added are probed again.
+    if caps is None or set(caps) != set(CAPS):
+        caps = probe(term)
+        if term.is_a_tty:
+            cache[key] = caps
+            try:
+                with open(filename, "w") as f:
+                    json.dump(cache, f, indent=4)
+            except Exception as e:
+                console.print(f"[red]Error saving terminal capabilities: {e}[/red]")
+    return caps
+
+
+class Styles:
+    """Every styled glyph a frame needs, built once per terminal.
+
+    Terminals without Unicode get ASCII glyphs and terminals with fewer
+    than eight colors get plain text, so drawing never has to check.
+    colors and truecolor come from the cached caps for the theme palettes.
+    """
+
+    def __init__(self, term, caps):
+        self.term = term
+        self.colors = caps["colors"]
+        self.truecolor = caps["truecolor"]
+        self.bce = caps["bce"]
+        self.color = self.colors >= 8
+        self.glyphs = UNICODE_GLYPHS if caps["unicode"] else ASCII_GLYPHS
+        glyphs = self.glyphs
+        self.head = self.paint("green", glyphs["head"])
+        self.body = self.paint("green", glyphs["body"])
+        self.food = self.paint("red", glyphs["food"])
+        self.powerup = self.paint("bright_yellow", glyphs["powerup"])
+        self.powerdown = self.paint("bright_red", glyphs["powerdown"])
+        self.portal = self.paint("magenta", glyphs["portal"])
+        self.wall = glyphs["wall"]
+        self.hints = {
+            (0, -1): self.paint("cyan", glyphs["up"]),
+            (0, 1): self.paint("cyan", glyphs["down"]),
+            (-1, 0): self.paint("cyan", glyphs["left"]),
+            (1, 0): self.paint("cyan", glyphs["right"]),
+        }
+
+    def paint(self, color, text):
+        return getattr(self.term, color)(text) if self.color else text
+
+    def snake_cells(self, color):
+        """(head, body) cells for a snake drawn in the named color."""
+        return (
+            self.paint(color, self.glyphs["head"]),
+            self.paint(color, self.glyphs["body"]),
+        )
+
+
+def styles_for(term):
+    term_caps = load_caps(term)
+    key = tuple(term_caps[name] for name in CAPS)
+    table = styles.get(key)
+    if table is None:
+        table = styles[key] = Styles(term, term_caps)
+    return table
@@ -0,0 +1,177 @@
+# themes.py
+import levels
+
+THEME_RATE = 2  # Animation frames per second.
+
+SUNSET = [
+    (92, 28, 84),
+    (150, 40, 82),
+    (204, 62, 68),
+    (240, 110, 58),
+    (250, 160, 70),
+    (240, 110, 58),
+    (204, 62, 68),
+    (150, 40, 82),
+]
+OCEAN = [
+    (0, 30, 70),
+    (0, 50, 100),
+    (0, 75, 130),
+    (0, 100, 150),
+    (0, 75, 130),
+    (0, 50, 100),
+]
+
+# Each theme is a palette, a fallback palette for terminals with fewer
+# than 256 colors, and a pattern. Palette entries are blessed background
+# names, RGB tuples or None for the terminal's own background.
+THEMES = {
+    "Default": ([None], [None], "solid"),
+    "Rainbow": (
+        ["on_red", "on_yellow", "on_green", "on_cyan", "on_blue", "on_magenta"],
+        ["on_red", "on_yellow", "on_green", "on_cyan", "on_blue", "on_magenta"],
+        "solid",
+    ),
+    "Dark": (["on_grey15", "on_grey19", "on_grey23"], ["on_black"], "solid"),
+    "Sunset": (SUNSET, ["on_red", "on_magenta"], "rows"),
+    "Waves": (OCEAN, ["on_blue", "on_cyan"], "diagonal"),
+}
+
+# Which palette entry a cell shows in a given frame.
+PATTERNS = {
+    "solid": lambda x, y, frame: frame,
+    "rows": lambda x, y, frame: y + frame,
+    "diagonal": lambda x, y, frame: x // 2 + y + frame,
+}
+
+TRUECOLOR_BACKGROUND = "\x1b[48;2;{};{};{}m"
+MAX_CACHED = 8
+frame_cache = {}  # (theme, level, styles) -> ThemeFrames, oldest first.
+
+
+def background(term, entry, truecolor=False):
+    """The escape sequence that selects a palette entry as background.
+
+    RGB entries are sent as 24-bit color where the terminal has it and as
+    the nearest of the 256 colors otherwise.
+    """
+    if entry is None:
+        return ""
+    if isinstance(entry, tuple):
+        if truecolor:
+            return TRUECOLOR_BACKGROUND.format(*entry)
+        return str(term.on_color(term.rgb_downconvert(*entry)))
+    return str(getattr(term, entry))
+
+
+def free_runs(level):
+    """(y, start, stop) for each horizontal run of free cells."""
+    runs = []
+    for y in range(level.height):
+        start = None
+        for x in range(level.width + 1):
+            free = x < level.width and level.grid[y * level.width + x] == levels.FREE
+            if free and start is None:
+                start = x
+            elif not free and start is not None:
+                runs.append((y, start, x))
+                start = None
+    return runs
+
+
+def erase(term, count, bce):
+    """Blank count cells in the current background without moving.
+
+    ECH only fills with the current background on terminals with bce;
+    elsewhere, as in screen and tmux, it would leave the default one.
+    """
+    if bce and term.ech:
+        return str(term.ech(count))
+    return " " * count
+
+
+class ThemeFrames:
+    """A theme's animation, precomputed for one level at game start.
+
+    frames[f] maps each open cell index to its empty-cell text in frame f,
+    so drawing an empty cell is one list lookup whatever the theme.
+    clears[f] repaints the whole background for frame f with one erase per
+    run of same-colored free cells instead of one write per cell, and
+    redraws the portals.
+    diffs[f] is True when stepping from frame f - 1 to f is cheaper as a
+    per-cell diff than as a clear.
+    """
+
+    def __init__(self, term, styles, name, level):
+        palette, basic, pattern = THEMES.get(name, THEMES["Default"])
+        if not styles.color:
+            palette = [None]
+        elif styles.colors < 256:
+            palette = basic
+        sgrs = [background(term, entry, styles.truecolor) for entry in palette]
+        cells = [sgr + " " + term.normal if sgr else " " for sgr in sgrs]
+        place = PATTERNS[pattern]
+        self.count = len(palette)
+        width = level.width
+        runs = free_runs(level)
+        portals = [i for i in level.open_cells if level.grid[i] == levels.PORTAL]
+        self.frames = []
+        self.clears = []
+        self.diffs = []
+        for frame in range(self.count):
+            table = [None] * len(level.grid)
+            for idx in level.open_cells:
+                if level.grid[idx] == levels.PORTAL:
+                    table[idx] = styles.portal
+                else:
+                    x, y = idx % width, idx // width
+                    table[idx] = cells[place(x, y, frame) % self.count]
+            self.frames.append(table)
+            parts = []
+            for y, start, stop in runs:
+                x = start
+                while x < stop:
+                    color = place(x, y, frame) % self.count
+                    end = x + 1
+                    while end < stop and place(end, y, frame) % self.count == color:
+                        end += 1
+                    parts.append(
+                        term.move_xy(x, y)
+                        + (sgrs[color] or term.normal)
+                        + erase(term, end - x, styles.bce)
+                    )
+                    x = end
+            parts.append(term.normal)
+            for idx in portals:
+                parts.append(term.move_xy(idx % width, idx // width) + styles.portal)
+            self.clears.append("".join(parts))
+        for frame, table in enumerate(self.frames):
+            previous = self.frames[frame - 1]
+            cost = 0
+            for idx in level.open_cells:
+                if table[idx] != previous[idx]:
+                    cost += len(term.move_xy(idx % width, idx // width)) + len(
+                        table[idx]
+                    )
+            self.diffs.append(cost < len(self.clears[frame]))
+
+    def frame_at(self, now):
+        return int(now * THEME_RATE) % self.count
+
+    def change(self, previous, frame):
+        """The clear for moving from frame previous to frame, or None when
+        the per-cell diff is cheaper."""
+        if previous is not None and (previous + 1) % self.count == frame:
+            if self.diffs[frame]:
+                return None
+        return self.clears[frame]
+
+
+def theme_frames(term, styles, name, level):
+    key = (name, level, styles)
+    frames = frame_cache.get(key)
+    if frames is None:
+        while len(frame_cache) >= MAX_CACHED:
+            del frame_cache[next(iter(frame_cache))]
+        frames = frame_cache[key] = ThemeFrames(term, styles, name, level)
+    return frames
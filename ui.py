@@ -1,33 +1,20 @@
 # ui.py
-import sys
+import time
+import daily
+from functools import partial
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from rich.prompt import Prompt
 from achievements import POSSIBLE_ACHIEVEMENTS
+from multiplayer import MAX_HUMANS, MAX_SNAKES, MIN_SNAKES, PLAYER_KEY_NAMES
+from snapshot import has_saved_game
+from streamstats import WINDOW
+from menu import Menu, cached_render, show_page, show_screen
 import audio
 
 console = Console()
 
 
-def safe_prompt(message, **kwargs):
-    """Wrapper around Prompt.ask that catches KeyboardInterrupt."""
-    try:
-        return Prompt.ask(message, **kwargs)
-    except (KeyboardInterrupt, EOFError):
-        print("\nExiting the game. Bye!")
-        sys.exit(0)
-
-
-def safe_input(prompt=""):
-    """Wrapper around input() that catches KeyboardInterrupt."""
-    try:
-        return input(prompt)
-    except (KeyboardInterrupt, EOFError):
-        print("\nExiting the game. Bye!")
-        sys.exit(0)
-
-
 # Start screen ASCII art options.
 START_SCREEN_ART = {
     "Art 1": r"""
@@ -64,56 +51,152 @@ START_SCREEN_ART = {
 }
 
 
-def entrance_menu(settings_manager):
-    console.clear()
-    # Choose ASCII art based on settings.
-    art_choice = settings_manager.options["8"]["value"]
+def entrance_screen(art_choice):
     snake_ascii = START_SCREEN_ART.get(art_choice, START_SCREEN_ART["Art 1"])
-    console.print(
+    return [
         Panel(
             snake_ascii,
             title="[bold green]SNAKE GAME[/bold green]",
             subtitle="Slither into Action!",
             border_style="bright_magenta",
         )
-    )
-    table = Table(show_header=False, box=None)
-    table.add_row("[bold yellow]1.[/bold yellow]", "Start Game")
-    table.add_row("[bold yellow]2.[/bold yellow]", "Instructions")
-    table.add_row("[bold yellow]3.[/bold yellow]", "About")
-    table.add_row("[bold yellow]4.[/bold yellow]", "Settings")
-    table.add_row("[bold yellow]5.[/bold yellow]", "Achievements & Stats")
-    table.add_row("[bold yellow]6.[/bold yellow]", "Quit")
-    console.print(table)
-    choice = safe_prompt("\nSelect an option", default="1")
-    return choice
+    ]
 
 
-def start_game_menu():
-    console.clear()
-    table = Table(show_header=False, box=None)
-    table.add_row("[bold yellow]1.[/bold yellow]", "Classic")
-    table.add_row("[bold yellow]2.[/bold yellow]", "Time Attack")
-    table.add_row("[bold yellow]3.[/bold yellow]", "Survival")
-    table.add_row("[bold yellow]B.[/bold yellow]", "Back")
-
-    console.print(Panel.fit("Select Game Mode", border_style="cyan"))
-    console.print(table)
-    mode_choice = safe_prompt("\nSelect a mode", default="1").strip().lower()
-    if mode_choice in ["b", "back"]:
+async def entrance_menu(settings_manager):
+    # Choose ASCII art based on settings.
+    art_choice = settings_manager.options["8"]["value"]
+    header = partial(cached_render, entrance_screen, art_choice)
+    items = [
+        ["1", "Start Game"],
+        ["2", "Instructions"],
+        ["3", "About"],
+        ["4", "Settings"],
+        ["5", "Achievements & Stats"],
+        ["6", "Quit", "6q"],
+    ]
+    if has_saved_game():
+        items.append(["R", "Resume Saved Game"])
+    return await Menu(header, items, default="1").choose()
+
+
+def start_game_screen():
+    return [Panel.fit("Select Game Mode", border_style="cyan")]
+
+
+async def start_game_menu():
+    header = partial(cached_render, start_game_screen)
+    items = [
+        ["1", "Classic"],
+        ["2", "Time Attack"],
+        ["3", "Survival"],
+        ["4", "Multiplayer"],
+        ["5", "Daily Challenge"],
+        ["B", "Back"],
+    ]
+    modes = {
+        "1": "classic",
+        "2": "time_attack",
+        "3": "survival",
+        "4": "multiplayer",
+        "5": "daily",
+    }
+    mode_choice = await Menu(header, items, default="1", back="B").choose()
+    return modes.get(mode_choice)
+
+
+def multiplayer_screen(question):
+    table = Table(title="Controls", show_header=True, header_style="bold cyan")
+    table.add_column("Player", justify="center")
+    table.add_column("Keys", justify="left")
+    for idx, keys in enumerate(PLAYER_KEY_NAMES, start=1):
+        table.add_row(f"P{idx}", keys)
+    return [Panel.fit("Multiplayer Setup", border_style="cyan"), table, question]
+
+
+async def multiplayer_menu():
+    """Ask for the number of human and AI snakes, or None to go back."""
+    items = [
+        [str(n), f"{n} human" if n == 1 else f"{n} humans"]
+        for n in range(1, MAX_HUMANS + 1)
+    ]
+    items.append(["B", "Back"])
+    humans = await Menu(
+        partial(cached_render, multiplayer_screen, "Number of human players"),
+        items,
+        default="2",
+        back="B",
+    ).choose()
+    if humans == "B":
         return None
-    elif mode_choice == "1":
-        return "classic"
-    elif mode_choice == "2":
-        return "time_attack"
-    elif mode_choice == "3":
-        return "survival"
-    else:
+    humans = int(humans)
+    min_bots = max(0, MIN_SNAKES - humans)
+    items = [[str(n), f"{n} AI"] for n in range(min_bots, MAX_SNAKES - humans + 1)]
+    items.append(["B", "Back"])
+    bots = await Menu(
+        partial(cached_render, multiplayer_screen, "Number of AI snakes"),
+        items,
+        default=str(max(min_bots, 1 if humans < 2 else 0)),
+        back="B",
+    ).choose()
+    if bots == "B":
         return None
+    return humans, int(bots)
+
+
+def multiplayer_results_menu(standings):
+    table = Table(title="Final Standings", show_header=True, header_style="bold blue")
+    table.add_column("Place", justify="center")
+    table.add_column("Snake", justify="left")
+    table.add_column("Score", justify="center")
+    table.add_column("Status", justify="center")
+    for place, entry in enumerate(standings, start=1):
+        status = "Alive" if entry["alive"] else "Out"
+        table.add_row(str(place), entry["name"], str(entry["score"]), status)
+    console.print(table)
 
 
-def instructions_menu():
-    console.clear()
+def daily_leaderboard_table(score_manager, day, highlight=None):
+    """A day's best daily challenge scores; the entry highlight is marked."""
+    table = Table(
+        title=f"Daily Challenge {day}", show_header=True, header_style="bold blue"
+    )
+    table.add_column("Rank", justify="center")
+    table.add_column("Score", justify="center")
+    table.add_column("Time (s)", justify="center")
+    table.add_column("Played At", justify="center")
+    for rank, entry in enumerate(score_manager.daily_leaderboard(day), start=1):
+        style = "bold green" if entry == highlight else None
+        table.add_row(
+            str(rank),
+            str(entry["score"]),
+            f"{entry['duration']:.1f}",
+            entry["time"],
+            style=style,
+        )
+    return table
+
+
+def daily_results_menu(score_manager, game_stats):
+    board = score_manager.daily_leaderboard(game_stats.day)
+    entry = next(
+        (
+            e
+            for e in board
+            if e["score"] == game_stats.score
+            and e["duration"] == round(game_stats.duration, 1)
+        ),
+        None,
+    )
+    console.print(daily_leaderboard_table(score_manager, game_stats.day, entry))
+    if entry is None:
+        console.print(
+            f"[yellow]{game_stats.score} did not make today's top "
+            f"{daily.LEADERBOARD_SIZE}.[/yellow]"
+        )
+
+
+def instructions_screen():
     instructions = """
 [bold underline]How to Play:[/bold underline]
 • Use the Arrow keys or W/A/S/D to control the snake.
@@ -124,27 +207,37 @@ def instructions_menu():
     - [bright_red]Power-Down (▲)[/bright_red]: Reduces your score and may shrink your snake.
 • In Time Attack mode, you have a limited time to score as high as possible.
 • In Survival mode, the game speeds up over time.
+• In Multiplayer mode, up to 8 human and AI snakes share the board; the last snake alive wins.
+• The Daily Challenge gives everyone the same food and power items each day; Q ends the run.
 • The walls are deadly – colliding with them or your own tail ends the game.
+• Pick a level in Settings: some add inner walls, and portals [magenta]○[/magenta] carry you to their twin.
 • After losing, press ENTER to return to the main menu.
 
 [bold underline]Controls:[/bold underline]
 • Movement: Arrow Keys or W/A/S/D
-• Menu Selection: Type the corresponding option and press ENTER.
+• Save & Quit: Press Q during a single-player game; resume it later from the main menu.
+• Multiplayer: P1 Arrow Keys, P2 W/A/S/D, P3 I/J/K/L, P4 T/F/G/H
+• Menu Selection: Press an option's key, or move with the Arrow keys and press ENTER.
 
 Enjoy the game and aim for a new high score!
     """
-    console.print(
+    return [
         Panel(
             instructions,
             title="[bold cyan]Instructions[/bold cyan]",
             border_style="cyan",
         )
+    ]
+
+
+async def instructions_menu():
+    await show_screen(
+        cached_render(instructions_screen),
+        prompt="Press ENTER to return to the main menu...",
     )
-    safe_input("\nPress ENTER to return to the main menu...")
 
 
-def about_menu():
-    console.clear()
+def about_screen():
     about_text = """
 [bold underline]About Snake Game[/bold underline]
 
@@ -162,89 +255,85 @@ Statistics and achievements track your progress.
 
 Enjoy slithering through the game and challenge yourself to beat your records!
     """
-    console.print(
+    return [
         Panel(
             about_text,
             title="[bold magenta]About Snake Game[/bold magenta]",
             border_style="magenta",
         )
+    ]
+
+
+async def about_menu():
+    await show_screen(
+        cached_render(about_screen),
+        prompt="Press ENTER to return to the main menu...",
     )
-    safe_input("\nPress ENTER to return to the main menu...")
 
 
-def settings_menu(settings_manager):
+# Shortcuts for settings 10 and up, leaving out R (Reset) and B (Back).
+SETTING_LETTERS = "ACDEFGHIJKLMNOPQSTUVWXYZ"
+
+
+def settings_items(settings_manager):
+    items = []
+    letters = iter(SETTING_LETTERS)
+    for key, option in settings_manager.options.items():
+        value = option["value"]
+        if option["type"] == "toggle":
+            value = "On" if value else "Off"
+        # Keys are picked with one keypress, so settings past 9 get letters.
+        shortcut = key if len(key) == 1 else next(letters)
+        items.append([key, f"{option['name']:<36} {value}", shortcut])
+    items.append(["R", "Reset to Defaults"])
+    items.append(["B", "Back to Main Menu"])
+    return items
+
+
+def settings_screen():
+    return [
+        Panel.fit("Settings", border_style="cyan"),
+        "Arrow keys to move, ENTER or Left/Right to change, B to go back.",
+    ]
+
+
+async def settings_menu(settings_manager):
+    header = partial(cached_render, settings_screen)
+    menu = Menu(header, settings_items(settings_manager), back="B", arrows=True)
     while True:
-        console.clear()
-        table = Table(title="Settings", show_header=True, header_style="bold cyan")
-        table.add_column("Option", justify="center")
-        table.add_column("Name", justify="left")
-        table.add_column("Value", justify="center")
-        options_list = list(settings_manager.options.items())
-        for key, option in options_list:
-            value = option["value"]
-            if option["type"] == "toggle":
-                value = "On" if value else "Off"
-            table.add_row(key, option["name"], str(value))
-        table.add_row("R", "Reset to Defaults", "")
-        table.add_row("B", "Back to Main Menu", "")
-        console.print(table)
-        choice = (
-            safe_prompt("\nSelect an option (number, R, or B)", default="B")
-            .strip()
-            .lower()
-        )
-        if choice in ["b", "back"]:
+        choice = await menu.choose()
+        if choice == "B":
             break
-        elif choice == "r":
-            confirm = safe_prompt(
-                "Reset all settings to default?", choices=["y", "n"], default="n"
-            )
-            if confirm.lower() == "y":
+        elif choice == "R":
+            if await menu.confirm("Reset all settings to default?"):
                 settings_manager.reset_settings()
-                console.print("[green]Settings have been reset to default.[/green]")
-                safe_input("Press ENTER to continue...")
-                console.clear()
-        elif choice in [opt_key for opt_key, _ in options_list]:
-            opt_key = choice
-            option = settings_manager.options[opt_key]
+                menu.status = menu.term.green("Settings have been reset to default.")
+        else:
+            option = settings_manager.options[choice]
             if option["type"] == "toggle":
                 new_val = not option["value"]
-                settings_manager.update_setting(opt_key, new_val)
-                console.print(
-                    f"[green]{option['name']} set to {'On' if new_val else 'Off'}.[/green]"
-                )
-                if opt_key == "6":
+                settings_manager.update_setting(choice, new_val)
+                shown = "On" if new_val else "Off"
+                if choice == "6":
                     if new_val:
                         audio.init_audio()
                     else:
                         audio.stop_music()
-                safe_input("Press ENTER to continue...")
-                console.clear()
-            elif option["type"] == "choice":
+            else:
                 choices = option["choices"]
-                choice_table = Table(
-                    title=f"Select {option['name']}", show_header=False
-                )
-                for idx, ch in enumerate(choices, start=1):
-                    choice_table.add_row(f"{idx}.", ch)
-                console.print(choice_table)
-                user_choice = safe_prompt(
-                    "Enter the number corresponding to your choice", default="1"
+                idx = (
+                    choices.index(option["value"])
+                    if option["value"] in choices
+                    else -menu.step
                 )
-                new_choice = choices[int(user_choice) - 1]
-                settings_manager.update_setting(opt_key, new_choice)
-                console.print(f"[green]{option['name']} set to {new_choice}.[/green]")
-                safe_input("Press ENTER to continue...")
-                console.clear()
-        else:
-            console.print("[red]Invalid input. Please try again.[/red]")
-            safe_input("Press ENTER to continue...")
-            console.clear()
+                new_val = shown = choices[(idx + menu.step) % len(choices)]
+                settings_manager.update_setting(choice, new_val)
+            menu.status = menu.term.green(f"{option['name']} set to {shown}.")
+        menu.items = settings_items(settings_manager)
 
 
-def achievement_details_menu(achievements_manager):
+async def achievement_details_menu(achievements_manager):
     # Show detailed information about each achievement.
-    console.clear()
     unlocked = achievements_manager.get_unlocked()
     locked = achievements_manager.get_locked()
     detail_table = Table(
@@ -264,28 +353,28 @@ def achievement_details_menu(achievements_manager):
         detail_table.add_row("Unlocked", ach["name"], detail, ach["unlock_time"])
     for ach in locked:
         detail_table.add_row("Locked", ach["name"], ach["detail"], "-")
-    console.print(detail_table)
-    safe_input("\nPress ENTER to return to the Achievements & Stats menu...")
+    await show_page(
+        detail_table, prompt="Press ENTER to return to the Achievements & Stats menu..."
+    )
 
 
-def high_scores_menu(score_manager):
-    console.clear()
+async def high_scores_menu(score_manager):
     table = Table(title="High Scores", show_header=True, header_style="bold blue")
     table.add_column("Mode", justify="center")
     table.add_column("Last Score", justify="center")
     table.add_column("High Score", justify="center")
-    modes = ["classic", "time_attack", "survival", "combined"]
+    modes = ["classic", "time_attack", "survival", "multiplayer", "daily", "combined"]
     for mode in modes:
         mode_display = mode.replace("_", " ").title()
         last = score_manager.scores.get(mode, {}).get("last", 0)
         high = score_manager.scores.get(mode, {}).get("high", 0)
         table.add_row(mode_display, str(last), str(high))
-    console.print(table)
-    safe_input("\nPress ENTER to return to the Achievements & Stats menu...")
+    await show_page(
+        table, prompt="Press ENTER to return to the Achievements & Stats menu..."
+    )
 
 
-def statistics_menu(score_manager, achievements_manager):
-    console.clear()
+async def statistics_menu(score_manager, achievements_manager):
     stats = score_manager.scores.get("statistics", {})
     total_games = achievements_manager.get_stats()["total_games"]
     avg_duration = (
@@ -315,29 +404,111 @@ def statistics_menu(score_manager, achievements_manager):
     # Total score from achievements manager.
     total_score = achievements_manager.get_stats()["total_score"]
     table.add_row("Total Score", str(total_score))
-    console.print(table)
-    safe_input("\nPress ENTER to return to the Achievements & Stats menu...")
+    dist_table = Table(
+        title=f"Score Distributions (trend over the last {WINDOW} games)",
+        show_header=True,
+        header_style="bold green",
+    )
+    dist_table.add_column("Mode", justify="left")
+    dist_table.add_column("Games", justify="center")
+    dist_table.add_column("Median", justify="center")
+    dist_table.add_column("p90", justify="center")
+    dist_table.add_column("Median s", justify="center")
+    dist_table.add_column("p90 s", justify="center")
+    dist_table.add_column("Recent Avg", justify="center")
+    dist_table.add_column("Trend", justify="left", no_wrap=True)
+    for mode in ["classic", "time_attack", "survival", "multiplayer", "daily"]:
+        dist = score_manager.distributions.get(mode)
+        if dist is None or not dist.games:
+            continue
+        dist_table.add_row(
+            mode.replace("_", " ").title(),
+            str(dist.games),
+            f"{dist.scores.quantile(0.5):.0f}",
+            f"{dist.scores.quantile(0.9):.0f}",
+            f"{dist.durations.quantile(0.5):.1f}",
+            f"{dist.durations.quantile(0.9):.1f}",
+            f"{dist.recent_scores.mean():.1f}",
+            dist.recent_scores.sparkline(width=15),
+        )
+    await show_page(
+        table,
+        dist_table,
+        prompt="Press ENTER to return to the Achievements & Stats menu...",
+    )
+
+
+async def memory_report_menu(memory_tracker):
+    table = Table(title="Memory Over Time", show_header=True, header_style="bold green")
+    table.add_column("After Game", justify="center")
+    table.add_column("Time", justify="center")
+    table.add_column("RSS (MB)", justify="center")
+    table.add_column("Traced (MB)", justify="center")
+    for games, when, rss, traced in list(memory_tracker.samples)[-15:]:
+        table.add_row(
+            str(games),
+            time.strftime("%H:%M:%S", time.localtime(when)),
+            "-" if rss is None else f"{rss / 1024:.1f}",
+            "-" if traced is None else f"{traced / 1024:.2f}",
+        )
+    page = [table]
+    sites = memory_tracker.top_sites()
+    if sites:
+        site_table = Table(
+            title="Top Allocation Growth Since Tracking Started",
+            show_header=True,
+            header_style="bold blue",
+        )
+        site_table.add_column("Site", justify="left")
+        site_table.add_column("Size (KB)", justify="center")
+        site_table.add_column("Growth (KB)", justify="center")
+        site_table.add_column("Blocks", justify="center")
+        for stat in sites:
+            frame = stat.traceback[0]
+            site_table.add_row(
+                f"{frame.filename}:{frame.lineno}",
+                f"{stat.size / 1024:.1f}",
+                f"{stat.size_diff / 1024:+.1f}",
+                str(stat.count),
+            )
+        page.append(site_table)
+    else:
+        page.append(
+            "Turn on Memory Tracking in Settings to see where memory is allocated."
+        )
+    await show_page(
+        *page, prompt="Press ENTER to return to the Achievements & Stats menu..."
+    )
 
 
-def achievements_stats_menu(score_manager, achievements_manager):
+def achievements_stats_screen():
+    return ["[bold]Achievements & Stats[/bold]\n"]
+
+
+async def achievements_stats_menu(
+    score_manager, achievements_manager, memory_tracker=None
+):
+    items = [
+        ["1", "View High Scores"],
+        ["2", "View Achievements"],
+        ["3", "View Game Statistics"],
+        ["4", "Clear Scores"],
+        ["5", "Clear Achievements"],
+    ]
+    if memory_tracker is not None:
+        items.append(["6", "Memory Report"])
+    items.append(["7", "Daily Challenge Leaderboard"])
+    items.append(["D", "View Achievement Details"])
+    items.append(["B", "Back"])
+    header = partial(cached_render, achievements_stats_screen)
+    menu = Menu(header, items, back="B")
     while True:
-        console.clear()
-        table = Table(title="Achievements & Stats", show_header=False, box=None)
-        table.add_row("[bold yellow]1.[/bold yellow]", "View High Scores")
-        table.add_row("[bold yellow]2.[/bold yellow]", "View Achievements")
-        table.add_row("[bold yellow]3.[/bold yellow]", "View Game Statistics")
-        table.add_row("[bold yellow]4.[/bold yellow]", "Clear Scores")
-        table.add_row("[bold yellow]5.[/bold yellow]", "Clear Achievements")
-        table.add_row("[bold yellow]D.[/bold yellow]", "View Achievement Details")
-        table.add_row("[bold yellow]B.[/bold yellow]", "Back")
-        console.print(table)
-        choice = safe_prompt("\nSelect an option", default="B").strip().lower()
-        if choice in ["b", "back"]:
+        choice = await menu.choose()
+        if choice == "B":
             break
         elif choice == "1":
-            high_scores_menu(score_manager)
+            await high_scores_menu(score_manager)
         elif choice == "2":
-            console.clear()
             unlocked = achievements_manager.get_unlocked()
             locked = achievements_manager.get_locked()
             ach_table = Table(
@@ -350,28 +521,28 @@ def achievements_stats_menu(score_manager, achievements_manager):
                 ach_table.add_row("Unlocked", ach["name"], ach["unlock_time"])
             for ach in locked:
                 ach_table.add_row("Locked", ach["name"], "-")
-            console.print(ach_table)
-            safe_input("\nPress ENTER to return to the Achievements & Stats menu...")
+            await show_page(
+                ach_table,
+                prompt="Press ENTER to return to the Achievements & Stats menu...",
+            )
         elif choice == "3":
-            statistics_menu(score_manager, achievements_manager)
+            await statistics_menu(score_manager, achievements_manager)
         elif choice == "4":
-            confirm = safe_prompt(
-                "Clear all scores? (y/n)", choices=["y", "n"], default="n"
-            )
-            if confirm.lower() == "y":
+            if await menu.confirm("Clear all scores?"):
                 score_manager.clear_scores()
-                console.print("[green]Scores cleared.[/green]")
-                safe_input("Press ENTER to continue...")
+                menu.status = menu.term.green("Scores cleared.")
         elif choice == "5":
-            confirm = safe_prompt(
-                "Clear all achievements? (y/n)", choices=["y", "n"], default="n"
-            )
-            if confirm.lower() == "y":
+            if await menu.confirm("Clear all achievements?"):
                 achievements_manager.clear_achievements()
-                console.print("[green]Achievements cleared.[/green]")
-                safe_input("Press ENTER to continue...")
-        elif choice == "d":
-            achievement_details_menu(achievements_manager)
-        else:
-            console.print("[red]Invalid input. Please try again.[/red]")
-            safe_input("Press ENTER to continue...")
+                menu.status = menu.term.green("Achievements cleared.")
+        elif choice == "6":
+            await memory_report_menu(memory_tracker)
+        elif choice == "7":
+            await show_page(
+                daily_leaderboard_table(score_manager, daily.today()),
+                prompt="Press ENTER to return to the Achievements & Stats menu...",
+            )
+        elif choice == "D":
+            await achievement_details_menu(achievements_manager)
+        if choice in ("1", "2", "3", "6", "7", "D"):
+            menu.redraw()